@@ -1,11 +1,17 @@
+import logging
+import operator
+
 from .udf.manager import UDFManager
 
+_LOG = logging.getLogger(__name__)
+
 # Initialize the UDF manager as a global instance
 udf_manager = UDFManager()
 
 def generate_ir(parsed_query):
     # Step 1: Extract relevant information from the parsed query
-    print("Generating IR from parsed query: ", parsed_query)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Generating IR from parsed query: %s", parsed_query)
     type = parsed_query.get("type")
     
     # Handle UDF creation
@@ -37,7 +43,8 @@ def generate_ir(parsed_query):
     
     # Handle regular queries
     condition = "from" if type == "select" else "table" if type == "insert" else "table" if type == "create_table" else None
-    print("condition: ", condition)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("condition: %s", condition)
     table_name = parsed_query.get(condition, None)
     if not table_name:
         # For INSERT statements, get table name from the 'into' field
@@ -52,80 +59,154 @@ def generate_ir(parsed_query):
     
     # Handle WHERE clause
     where = parsed_query.get("where", [])
-    if where:
-        if isinstance(where, dict):
-            # Single filter condition
-            if where.get("type") == "function_call":
+    if not where:
+        where = []  # Empty where clause
+    elif not isinstance(where, dict):
+        # Multiple filter conditions
+        filters = []
+        for filter_condition in where:
+            if filter_condition.get("type") == "function_call":
                 # Function call in WHERE clause
-                return {
-                    "type": type,
-                    "table": table_name,
-                    "columns": columns,
-                    "where": where  # Keep the function call structure intact
-                }
+                filters.append(filter_condition)  # Keep the function call structure intact
             else:
-                return {
-                    "type": type,
-                    "table": table_name,
-                    "columns": columns,
-                    "where": where  # Keep the comparison structure intact
-                }
-        else:
-            # Multiple filter conditions
-            filters = []
-            for filter_condition in where:
-                if filter_condition.get("type") == "function_call":
-                    # Function call in WHERE clause
-                    filters.append(filter_condition)  # Keep the function call structure intact
-                else:
-                    filters.append({
-                        "column": filter_condition["left"],
-                        "operator": filter_condition["op"],
-                        "value": filter_condition["right"]
-                    })
-            return {
-                "type": type,
-                "table": table_name,
-                "columns": columns,
-                "where": filters
-            }
+                filters.append({
+                    "column": filter_condition["left"],
+                    "operator": filter_condition["op"],
+                    "value": filter_condition["right"]
+                })
+        where = filters
+    # A single filter condition, comparison or function call, keeps its structure intact
     
     # Create the intermediate representation
     ir = {
         "type": type,
         "table": table_name,
         "columns": columns,
-        "where": []  # Empty where clause
+        "where": where
     }
     
+    # Only SELECT DISTINCT removes duplicate result rows
+    if type == "select":
+        ir["distinct"] = bool(parsed_query.get("distinct"))
     # Add values for INSERT statements
-    if type == "insert":
+    elif type == "insert":
         ir["values"] = parsed_query.get("values", [])
 
-    print("Generated IR: ", ir)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Generated IR: %s", ir)
     return ir
 
-def _replace_params(body, params, args):
+def _replace_params(body, params, args, name):
     """Helper function to replace parameter placeholders with actual arguments."""
+    # A missing argument would otherwise leave its parameter name in the
+    # body, to be read as a column or a string literal at query time
+    if len(args) != len(params):
+        raise ValueError(f"Function '{name}' expects {len(params)} arguments, got {len(args)}")
+    # Resolve each parameter's argument once, so the walk is a dict lookup
+    # per string instead of a scan over every parameter.
+    bindings = {}
+    for param, arg in zip(params, args):
+        if param["name"] not in bindings:
+            bindings[param["name"]] = arg.strip("'\"") if isinstance(arg, str) else arg
+    return _substitute_params(body, bindings)
+
+def _substitute_params(body, bindings):
+    """Return a copy of ``body`` with parameter names replaced from ``bindings``."""
     if isinstance(body, str):
-        for i, param in enumerate(params):
-            if body == param["name"]:
-                if isinstance(args[i], str):
-                    return args[i].strip("'\"") 
-                return args[i]
-        return body
+        return bindings.get(body, body)
     elif isinstance(body, dict):
-        new_body = {}
-        for key, value in body.items():
-            new_body[key] = _replace_params(value, params, args)
-        return new_body
+        return {key: _substitute_params(value, bindings) for key, value in body.items()}
     elif isinstance(body, list):
-        return [_replace_params(item, params, args) for item in body]
+        return [_substitute_params(item, bindings) for item in body]
     else:
         return body
 
+def divide(left, right):
+    return left / right if right != 0 else None # Division by zero gives NULL
+
+# What the arithmetic and comparison operators of an inlined expression
+# compute, by node type. _fold_constants applies them to constants here and
+# the SELECT code generated in common.statements applies them to rows.
+INLINED_OPERATORS = {
+    "arithmetic": {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": divide},
+    "comparison": {
+        ">": operator.gt, "<": operator.lt, ">=": operator.ge,
+        "<=": operator.le, "=": operator.eq, "!=": operator.ne,
+    },
+}
+
+# Node types wrapping a single expression, and the key holding it
+_FOLD_WRAPPED = {"return_stmt": "value", "inlined_expression": "expression"}
+
+_NO_CONSTANT = object()
+
+def _constant_value(node):
+    """Value of a constant expression leaf, or _NO_CONSTANT."""
+    # Bare strings are left alone: they may name a column
+    if node is None or isinstance(node, (int, float)):
+        return node
+    if isinstance(node, dict) and node.get("type") == "literal" and "value" in node:
+        return node["value"]
+    return _NO_CONSTANT
+
+def _fold_constants(node):
+    """
+    Fold the parts of an inlined expression that do not depend on a row.
+
+    Arithmetic and comparisons over constants are computed once, and an
+    IF with a constant condition is replaced by the branch it takes, e.g.
+    when a UDF is called with literal arguments. Anything that would fail
+    is left for query time to fail on the rows that reach it, as before.
+    """
+    if not isinstance(node, dict):
+        return node
+    node_type = node.get("type")
+    if node_type in INLINED_OPERATORS:
+        if "left" not in node or "right" not in node:
+            return node
+        left = _fold_constants(node["left"])
+        right = _fold_constants(node["right"])
+        if left is not node["left"] or right is not node["right"]:
+            node = dict(node, left=left, right=right)
+        func = INLINED_OPERATORS[node_type].get(node.get("op"))
+        left_value = _constant_value(left)
+        right_value = _constant_value(right)
+        if func is None or left_value is _NO_CONSTANT or right_value is _NO_CONSTANT:
+            return node
+        try:
+            value = func(left_value, right_value)
+        except Exception:
+            return node
+        # A string result stays a literal node so it is not read as a column
+        return {"type": "literal", "value": value} if isinstance(value, str) else value
+    if node_type == "if_stmt":
+        if not all(key in node for key in ("condition", "then", "else")):
+            return node
+        condition = _fold_constants(node["condition"])
+        condition_value = _constant_value(condition)
+        if condition_value is not _NO_CONSTANT:
+            return _fold_constants(node["then"] if condition_value else node["else"])
+        folded = dict(node)
+        folded["condition"] = condition
+        folded["then"] = _fold_constants(node["then"])
+        folded["else"] = _fold_constants(node["else"])
+        return folded
+    key = _FOLD_WRAPPED.get(node_type)
+    if key is not None and key in node:
+        child = _fold_constants(node[key])
+        if child is not node[key]:
+            node = dict(node)
+            node[key] = child
+    return node
+
 def inline_udf_in_ir(ir, udf_manager: UDFManager):
-    """Recursively traverse the IR and inline UDFs."""
+    """
+    Recursively traverse the IR and inline UDFs.
+
+    Only the dicts and lists on the path to a function call are copied;
+    parts without one are shared with the input, so statements without UDF
+    calls come back as they are.
+    """
     if isinstance(ir, dict):
         if ir.get("type") == "function_call":
             function_name = ir.get("function_name")
@@ -136,7 +217,7 @@ def inline_udf_in_ir(ir, udf_manager: UDFManager):
             if not udf_def:
                 raise ValueError(f"UDF '{function_name}' not found.")
 
-            inlined_body = _replace_params(udf_def["body"], udf_def["params"], arguments)
+            inlined_body = _fold_constants(_replace_params(udf_def["body"], udf_def["params"], arguments, function_name))
             
             # Return the inlined expression directly
             return {
@@ -150,13 +231,28 @@ def inline_udf_in_ir(ir, udf_manager: UDFManager):
             
         else:
             # Recursively process other parts of the IR
-            new_ir = {}
+            new_ir = None
             for key, value in ir.items():
-                new_ir[key] = inline_udf_in_ir(value, udf_manager)
-            return new_ir
+                if not isinstance(value, (dict, list)):
+                    continue
+                new_value = inline_udf_in_ir(value, udf_manager)
+                if new_value is not value:
+                    if new_ir is None:
+                        new_ir = dict(ir)
+                    new_ir[key] = new_value
+            return ir if new_ir is None else new_ir
             
     elif isinstance(ir, list):
-        return [inline_udf_in_ir(item, udf_manager) for item in ir]
+        new_list = None
+        for i, item in enumerate(ir):
+            if not isinstance(item, (dict, list)):
+                continue
+            new_item = inline_udf_in_ir(item, udf_manager)
+            if new_item is not item:
+                if new_list is None:
+                    new_list = list(ir)
+                new_list[i] = new_item
+        return ir if new_list is None else new_list
         
     else:
         # Base case: not a dict or list, or not a function call
@@ -165,6 +261,28 @@ def inline_udf_in_ir(ir, udf_manager: UDFManager):
 import os
 import json
 from core.json_table import JSONTable
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib parser
+    orjson = None
+
+# Parsed table files keyed by path, with the (mtime_ns, size) they were read at
+_table_schema_cache = {}
+
+def _load_table_schema(file_path):
+    """Read a table's JSON file, reusing the parsed copy while the file is unchanged."""
+    stat = os.stat(file_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _table_schema_cache.get(file_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(file_path, "rb") as file:
+        data = file.read()
+    schema = orjson.loads(data) if orjson is not None else json.loads(data)
+    _table_schema_cache[file_path] = (stamp, schema)
+    return schema
+
 def validate_ir(ir, schema):
     # Handle UDF validation
     if ir["type"] == "create_function":
@@ -172,7 +290,8 @@ def validate_ir(ir, schema):
         return True
         
     # Step 1: Check if the table exists in the schema
-    print("Validating IR: ", ir)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Validating IR: %s", ir)
     if ir["type"] == "select":
         return validate_select_ir(ir, schema)
     elif ir["type"] == "create_table":
@@ -187,11 +306,13 @@ def validate_ir(ir, schema):
 
 def pretty_print_ir(ir):
     # Step 1: Format the IR for better readability
-    print("Pretty printing IR: ", ir)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Pretty printing IR: %s", ir)
     formatted_ir = f"Query on table: {ir['table']}\n"
     formatted_ir += "Columns: " + ", ".join(ir["columns"]) + "\n"
     formatted_ir += "Filters:\n"
-    print("formatted_ir: ", formatted_ir)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("formatted_ir: %s", formatted_ir)
     if  len(ir["filters"]) == 0:
         formatted_ir += "  - No filters applied\n"
     else:
@@ -207,30 +328,27 @@ def validate_select_ir(ir, schema):
     table = ir["table"]
     file_path = f"data/{table}.json"
     if os.path.exists(file_path):
-        with open(file_path, "r") as file:
-            schema = json.load(file)
-            try:
-                # Step 2: Validate columns
-                if ir["columns"] != ["all"]:
-                        for column in ir["columns"]:
-                            if column not in schema["columns"]:
-                                print(f"Column {column} does not exist in table {ir['table']}.")
-                                raise ValueError(f"Column {column} does not exist in table {ir['table']}.")
-
-                # Step 3: Validate filters
-                for filter_condition in ir["filters"]:
-                    print("filter_condition: ", filter_condition)
-                    if len(filter_condition) > 0 and filter_condition["column"] not in schema["columns"]:
-                        print(f"Filter column {filter_condition['column']} does not exist in table {ir['table']}.")
-                        raise ValueError(f"Filter column {filter_condition['column']} does not exist in table {ir['table']}.")
-
-                return True
-            except KeyError as e:
-                print(f"Key error in schema validation: {e}")
-                raise ValueError(f"Invalid schema structure for table {ir['table']}.")
+        schema = _load_table_schema(file_path)
+        try:
+            # Step 2: Validate columns
+            if ir["columns"] != ["all"]:
+                    for column in ir["columns"]:
+                        if column not in schema["columns"]:
+                            raise ValueError(f"Column {column} does not exist in table {ir['table']}.")
+
+            # Step 3: Validate filters
+            for filter_condition in ir["filters"]:
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug("filter_condition: %s", filter_condition)
+                if len(filter_condition) > 0 and filter_condition["column"] not in schema["columns"]:
+                    raise ValueError(f"Filter column {filter_condition['column']} does not exist in table {ir['table']}.")
+
+            return True
+        except KeyError as e:
+            _LOG.debug("Key error in schema validation: %s", e)
+            raise ValueError(f"Invalid schema structure for table {ir['table']}.")
         
     else:
-        print(f"Table {ir['table']} does not exist in the schema.")
         raise ValueError(f"Table {ir['table']} does not exist in the schema.")
 
 
@@ -250,7 +368,6 @@ def validate_create_table_ir(ir, schema):
                 raise ValueError(f"Duplicate column name: {column['name']}")
             else: 
                 column_set.add(column["name"])
-        print("True")
         return True
     
 # Example usage:
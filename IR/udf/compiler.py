@@ -1,8 +1,9 @@
 import llvmlite.binding as llvm
 import llvmlite.ir as ir
-from typing import Dict, Any, Callable, List, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import ctypes
 import ast
+import functools
 import re
 
 # Initialize LLVM
@@ -10,6 +11,22 @@ llvm.initialize()
 llvm.initialize_native_target()
 llvm.initialize_native_asmprinter()
 
+
+@functools.lru_cache(maxsize=256)
+def _parse_cleaned_body(cleaned_body: str) -> ast.Module:
+    """Parse a cleaned UDF body; identical bodies share one (read-only) tree."""
+    return ast.parse(cleaned_body)
+
+
+def _names_in_tree(tree: ast.AST) -> Tuple[str, ...]:
+    """Collect the sorted variable names referenced in a parsed body."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id not in {'True', 'False', 'None'}:
+                names.add(node.id)
+    return tuple(sorted(names))
+
 class UDFCompiler:
     def __init__(self):
         self.module = ir.Module(name="udf_module")
@@ -72,8 +89,10 @@ class UDFCompiler:
             block = func.append_basic_block(name="entry")
             builder = ir.IRBuilder(block)
             
-            # Extract argument names from the body
-            arg_names = self._extract_arg_names(body)
+            # Parse the body once; argument extraction and code generation
+            # both walk the same tree.
+            body_ast = self._parse_body(body)
+            arg_names = self._extract_arg_names(body, body_ast)
             
             # Create variable mapping
             variables = {}
@@ -82,7 +101,7 @@ class UDFCompiler:
                 ir_arg.name = arg_name
             
             # Parse and compile the body
-            result = self._compile_body(builder, body, variables, ret_type)
+            result = self._compile_body(builder, body, variables, ret_type, body_ast)
             builder.ret(result)
             
             # Optimize and compile to machine code
@@ -90,19 +109,19 @@ class UDFCompiler:
         except Exception as e:
             raise ValueError(f"Failed to compile function: {str(e)}")
     
-    def _extract_arg_names(self, body: str) -> List[str]:
+    def _parse_body(self, body: str) -> ast.Module:
+        """Clean and parse the function body."""
+        return _parse_cleaned_body(self._clean_body(body))
+
+    def _extract_arg_names(self, body: str, body_ast: Optional[ast.Module] = None) -> List[str]:
         """Extract argument names from the function body."""
         # Look for variable names that appear in expressions
-        names = set()
-        try:
-            tree = ast.parse(self._clean_body(body))
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Name):
-                    if node.id not in {'True', 'False', 'None'}:
-                        names.add(node.id)
-        except:
-            pass
-        return sorted(list(names))
+        if body_ast is None:
+            try:
+                body_ast = self._parse_body(body)
+            except (SyntaxError, ValueError):
+                return []
+        return list(_names_in_tree(body_ast))
     
     def _clean_body(self, body: str) -> str:
         """Clean up the function body for parsing."""
@@ -122,14 +141,13 @@ class UDFCompiler:
             
         return '\n'.join(cleaned_lines)
     
-    def _compile_body(self, builder: ir.IRBuilder, body: str, variables: Dict[str, Any], return_type: ir.Type) -> ir.Value:
+    def _compile_body(self, builder: ir.IRBuilder, body: str, variables: Dict[str, Any], return_type: ir.Type,
+                      body_ast: Optional[ast.Module] = None) -> ir.Value:
         """Compile the function body."""
         try:
-            # Clean up the body
-            cleaned_body = self._clean_body(body)
-            
-            # Parse the body
-            body_ast = ast.parse(cleaned_body)
+            # Parse the body unless the caller already did
+            if body_ast is None:
+                body_ast = self._parse_body(body)
             
             # Handle multiple statements
             if isinstance(body_ast, ast.Module):
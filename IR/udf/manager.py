@@ -1,8 +1,62 @@
 import os
 import json
-from typing import Dict, Any, Callable, Union
+import operator
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
 from .parser import UDFParser
 
+
+def _to_int(value: Any) -> int:
+    return int(float(value))  # Handle float strings that represent integers
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    elif isinstance(value, (int, float)):
+        return bool(value)
+    elif isinstance(value, str):
+        return value.lower() == 'true'
+    return bool(value)
+
+
+# Conversions applied to arguments and results, by lower-cased SQL type.
+# Other types are passed through unchanged.
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "float": float,
+    "int": _to_int,
+    "bool": _to_bool,
+}
+
+_COMPARE_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    ">": operator.gt, "<": operator.lt,
+    ">=": operator.ge, "<=": operator.le,
+    "=": operator.eq, "!=": operator.ne,
+}
+_ARITH_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add, "-": operator.sub,
+    "*": operator.mul, "/": operator.truediv,
+}
+
+
+def _raise_at_eval(error: Exception) -> Callable[[Dict[str, Any]], Any]:
+    # Invalid nodes only fail when a call actually reaches them, as they
+    # do in _evaluate_expression
+    def fail(bindings):
+        raise error
+    return fail
+
+
+def _literal(expr: str) -> Any:
+    """Value of a string in a UDF body that is not a parameter name."""
+    if expr.lower() in ('true', 'false'):
+        return expr.lower() == 'true'
+    try:
+        if '.' in expr:
+            return float(expr)
+        return int(expr)
+    except ValueError:
+        return expr
+
 class UDFManager:
     """Manages User-Defined Functions (UDFs)."""
     
@@ -13,6 +67,8 @@ class UDFManager:
         self.udfs: Dict[str, Dict] = {}
         self.parser = UDFParser()
         self.functions: Dict[str, Callable] = {}
+        # Compiled bodies by function name, with the definition they came from
+        self._compiled: Dict[str, Tuple[Dict, Callable[[Dict[str, Any]], Any]]] = {}
         self._load_saved_udfs()
         
     def _load_saved_udfs(self) -> None:
@@ -68,61 +124,141 @@ class UDFManager:
         
     def execute_function(self, name: str, args: list) -> Any:
         """Execute a UDF with given arguments."""
+        body, params, return_type, convert_result = self._resolve(name, len(args))
+        result = body(self._bind_arguments(params, args))
+        return self._convert_result(result, return_type, convert_result)
+
+    def execute_batch(self, name: str, arg_rows: Iterable[Sequence[Any]]) -> List[Any]:
+        """
+        Execute a UDF once per row of arguments.
+
+        The function lookup and the parameter and return type conversions
+        are resolved once for the whole batch rather than on every call.
+
+        Args:
+            name: Name of the function
+            arg_rows: One argument sequence per call, e.g. ``zip(col_a, col_b)``
+
+        Returns:
+            List of results, one per argument row
+        """
+        body, params, return_type, convert_result = self._resolve(name)
+        arity = len(params)
+        results = []
+        for args in arg_rows:
+            if len(args) != arity:
+                raise ValueError(f"Function '{name}' expects {arity} arguments, got {len(args)}")
+            result = body(self._bind_arguments(params, args))
+            results.append(self._convert_result(result, return_type, convert_result))
+        return results
+
+    def _resolve(self, name: str, arg_count: Optional[int] = None) -> Tuple[Callable, List[Tuple], str, Optional[Callable]]:
+        """
+        Look up a UDF's compiled body and the converters for its parameters
+        and result.
+
+        If arg_count is given it is checked against the UDF's arity.
+        """
         if name not in self.udfs:
             raise ValueError(f"Function '{name}' not found")
             
         udf = self.udfs[name]
         
         # Validate argument count
-        if len(args) != len(udf["params"]):
-            raise ValueError(f"Function '{name}' expects {len(udf['params'])} arguments, got {len(args)}")
-            
-        # Create variable bindings
-        bindings = {}
-        for param, arg in zip(udf["params"], args):
-            # Convert argument to appropriate type based on parameter type
+        if arg_count is not None and arg_count != len(udf["params"]):
+            raise ValueError(f"Function '{name}' expects {len(udf['params'])} arguments, got {arg_count}")
+
+        params = []
+        for param in udf["params"]:
             param_type = param["type"].lower()
+            params.append((param["name"], param_type, _CONVERTERS.get(param_type)))
+        return_type = udf["return_type"].lower()
+        return self._compiled_body(name, udf), params, return_type, _CONVERTERS.get(return_type)
+
+    def _compiled_body(self, name: str, udf: Dict) -> Callable[[Dict[str, Any]], Any]:
+        """Compile a UDF's body once and reuse it until the UDF is redefined."""
+        cached = self._compiled.get(name)
+        if cached is not None and cached[0] is udf:
+            return cached[1]
+        param_names = frozenset(param["name"] for param in udf["params"])
+        try:
+            body = self._compile_expression(udf["body"], param_names)
+        except (KeyError, TypeError):
+            # A malformed body keeps failing only on the calls that reach
+            # the bad node
+            tree = udf["body"]
+            body = lambda bindings: self._evaluate_expression(tree, bindings)
+        self._compiled[name] = (udf, body)
+        return body
+
+    def _compile_expression(self, expr: Any, param_names: frozenset) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Compile an expression into a function of the variable bindings.
+
+        The result is equivalent to _evaluate_expression(expr, bindings) for
+        bindings of exactly param_names, but the tree is dispatched on once:
+        node types, operators and literal strings are resolved here instead
+        of on every call.
+        """
+        if isinstance(expr, dict):
+            if "type" not in expr:
+                return _raise_at_eval(KeyError("type"))
+            expr_type = expr["type"]
+            if expr_type == "if_stmt":
+                condition = expr["condition"]
+                left = self._compile_expression(condition["left"], param_names)
+                right = self._compile_expression(condition["right"], param_names)
+                # An unknown operator makes the condition false
+                compare = _COMPARE_OPS.get(condition["op"], lambda l, r: False)
+                then = self._compile_expression(expr["then"], param_names)
+                otherwise = self._compile_expression(expr["else"], param_names)
+                return lambda bindings: (then(bindings) if compare(left(bindings), right(bindings))
+                                         else otherwise(bindings))
+            if expr_type == "return_stmt":
+                return self._compile_expression(expr["value"], param_names)
+            if expr_type in ("comparison", "arithmetic"):
+                left = self._compile_expression(expr["left"], param_names)
+                right = self._compile_expression(expr["right"], param_names)
+                ops = _COMPARE_OPS if expr_type == "comparison" else _ARITH_OPS
+                func = ops.get(expr["op"])
+                if func is None:
+                    fail = _raise_at_eval(ValueError(f"Unknown operator: {expr['op']}"))
+                    func = lambda l, r: fail(None)
+                return lambda bindings: func(left(bindings), right(bindings))
+            if expr_type == "function_call":
+                # Nested calls are looked up when they run, so they see the
+                # callee's current definition
+                function_name = expr["function_name"]
+                args = [self._compile_expression(arg, param_names) for arg in expr["arguments"]]
+                return lambda bindings: self.execute_function(function_name, [arg(bindings) for arg in args])
+            return _raise_at_eval(ValueError(f"Unknown expression type: {expr_type}"))
+
+        if isinstance(expr, str):
+            if expr in param_names:
+                return operator.itemgetter(expr)
+            value = _literal(expr)
+        else:
+            value = expr
+        return lambda bindings: value
+
+    @staticmethod
+    def _bind_arguments(params: List[Tuple], args: Sequence[Any]) -> Dict[str, Any]:
+        """Create variable bindings, converting each argument to its parameter type."""
+        bindings = {}
+        for (param_name, param_type, convert), arg in zip(params, args):
             try:
-                if param_type == "float":
-                    arg_value = float(arg)
-                elif param_type == "int":
-                    arg_value = int(float(arg))  # Handle float strings that represent integers
-                elif param_type == "bool":
-                    if isinstance(arg, bool):
-                        arg_value = arg
-                    elif isinstance(arg, (int, float)):
-                        arg_value = bool(arg)
-                    elif isinstance(arg, str):
-                        arg_value = arg.lower() == 'true'
-                    else:
-                        arg_value = bool(arg)
-                else:
-                    arg_value = arg
-                bindings[param["name"]] = arg_value
+                bindings[param_name] = convert(arg) if convert is not None else arg
             except (ValueError, TypeError) as e:
-                raise ValueError(f"Invalid argument type for parameter '{param['name']}': expected {param_type}, got {type(arg).__name__}")
-            
-        # Execute the function body
-        result = self._evaluate_expression(udf["body"], bindings)
-        
-        # Convert result to the declared return type
-        return_type = udf["return_type"].lower()
+                raise ValueError(f"Invalid argument type for parameter '{param_name}': expected {param_type}, got {type(arg).__name__}")
+        return bindings
+
+    @staticmethod
+    def _convert_result(result: Any, return_type: str, convert: Optional[Callable]) -> Any:
+        """Convert a result to the declared return type."""
+        if convert is None:
+            return result
         try:
-            if return_type == "float":
-                return float(result)
-            elif return_type == "int":
-                return int(float(result))
-            elif return_type == "bool":
-                if isinstance(result, bool):
-                    return result
-                elif isinstance(result, (int, float)):
-                    return bool(result)
-                elif isinstance(result, str):
-                    return result.lower() == 'true'
-                else:
-                    return bool(result)
-            else:
-                return result
+            return convert(result)
         except (ValueError, TypeError) as e:
             raise ValueError(f"Invalid return value type: expected {return_type}, got {type(result).__name__}")
         
@@ -235,6 +371,7 @@ class UDFManager:
         if name in self.functions:
             del self.functions[name]
             del self.udfs[name]
+            self._compiled.pop(name, None)
             filepath = os.path.join(self.data_dir, f"{name}.json")
             if os.path.exists(filepath):
                 os.remove(filepath)
@@ -1,10 +1,30 @@
 from typing import Dict, List, Tuple, Union
 import re
 
+_KEYWORDS = frozenset({'int', 'float', 'bool', 'return', 'if', 'else', 'while'})
+_VALID_TYPES = frozenset({'int', 'float', 'bool'})
+
+# Compiled once at import; parse_function_definition runs for every UDF load.
+_SIGNATURE_RE = re.compile(
+    r'\s*CREATE\s+FUNCTION\s+(\w+)\s*\((.*?)\)\s*RETURNS\s+(\w+)',
+    re.IGNORECASE | re.DOTALL
+)
+_BODY_RE = re.compile(r'BEGIN\s*(.*?)\s*END\s*;', re.IGNORECASE | re.DOTALL)
+_IF_RE = re.compile(
+    r'\s*IF\s+(.*?)\s+THEN\s*(.*?)\s*ELSE\s*(.*?)\s*END\s*IF\s*;',
+    re.IGNORECASE | re.DOTALL
+)
+_RETURN_RE = re.compile(r'RETURN\s+(.*?)\s*;', re.IGNORECASE)
+_ARG_RE = re.compile(r'\s*(\w+)\s+(\w+)\s*')
+
+# Operators tried by _parse_expression, in priority order.
+_EXPR_OPERATORS = ('+', '-', '*', '/', '>=', '<=', '>', '<', '==', '!=')
+_HAS_OP_RE = re.compile(r'[-+*/<>=!]')
+
 class UDFParser:
     def __init__(self):
-        self.keywords = {'int', 'float', 'bool', 'return', 'if', 'else', 'while'}
-        self.valid_types = {'int', 'float', 'bool'}
+        self.keywords = _KEYWORDS
+        self.valid_types = _VALID_TYPES
         
     def parse_function_definition(self, udf_text: str) -> Dict[str, Union[str, List[Dict[str, str]], str]]:
         """
@@ -33,11 +53,7 @@ class UDFParser:
         udf_text = udf_text.strip()
         
         # Extract function signature with more flexible whitespace handling
-        signature_match = re.match(
-            r'\s*CREATE\s+FUNCTION\s+(\w+)\s*\((.*?)\)\s*RETURNS\s+(\w+)',
-            udf_text,
-            re.IGNORECASE | re.DOTALL
-        )
+        signature_match = _SIGNATURE_RE.match(udf_text)
         
         if not signature_match:
             raise ValueError("Invalid function definition syntax")
@@ -54,11 +70,7 @@ class UDFParser:
         params = self._parse_arguments(args_str)
         
         # Extract function body with more flexible whitespace handling
-        body_match = re.search(
-            r'BEGIN\s*(.*?)\s*END\s*;',
-            udf_text,
-            re.IGNORECASE | re.DOTALL
-        )
+        body_match = _BODY_RE.search(udf_text)
         
         if not body_match:
             raise ValueError("Function body not found")
@@ -66,11 +78,7 @@ class UDFParser:
         body = body_match.group(1).strip()
         
         # Handle if-else conditions
-        if_match = re.match(
-            r'\s*IF\s+(.*?)\s+THEN\s*(.*?)\s*ELSE\s*(.*?)\s*END\s*IF\s*;',
-            body,
-            re.IGNORECASE | re.DOTALL
-        )
+        if_match = _IF_RE.match(body)
         
         if if_match:
             condition = if_match.group(1).strip()
@@ -78,8 +86,8 @@ class UDFParser:
             else_body = if_match.group(3).strip()
             
             # Extract return values from then and else bodies
-            then_return = re.match(r'RETURN\s+(.*?)\s*;', then_body, re.IGNORECASE)
-            else_return = re.match(r'RETURN\s+(.*?)\s*;', else_body, re.IGNORECASE)
+            then_return = _RETURN_RE.match(then_body)
+            else_return = _RETURN_RE.match(else_body)
             
             if not then_return or not else_return:
                 raise ValueError("Both IF and ELSE blocks must contain RETURN statements")
@@ -109,7 +117,7 @@ class UDFParser:
             }
         else:
             # Handle simple return statement
-            return_match = re.match(r'RETURN\s+(.*?)\s*;', body, re.IGNORECASE)
+            return_match = _RETURN_RE.match(body)
             if not return_match:
                 raise ValueError("Invalid function body: must contain a RETURN statement")
             
@@ -137,7 +145,7 @@ class UDFParser:
                 continue
                 
             # Handle more flexible whitespace in argument definitions
-            parts = re.match(r'\s*(\w+)\s+(\w+)\s*', arg)
+            parts = _ARG_RE.match(arg)
             if not parts:
                 raise ValueError(f"Invalid argument format: {arg}")
                 
@@ -189,16 +197,18 @@ class UDFParser:
         # Clean up input
         expr = expr.strip()
         
-        # Check for basic arithmetic operations
-        for op in ['+', '-', '*', '/', '>=', '<=', '>', '<', '==', '!=']:
-            if op in expr:
-                left, right = expr.split(op, 1)
-                return {
-                    'type': 'binary_op',
-                    'operator': op,
-                    'left': self._parse_expression(left.strip()),
-                    'right': self._parse_expression(right.strip())
-                }
+        # Check for basic arithmetic operations; a single scan rules out
+        # operands (the common leaf case) before trying each operator.
+        if _HAS_OP_RE.search(expr):
+            for op in _EXPR_OPERATORS:
+                if op in expr:
+                    left, right = expr.split(op, 1)
+                    return {
+                        'type': 'binary_op',
+                        'operator': op,
+                        'left': self._parse_expression(left.strip()),
+                        'right': self._parse_expression(right.strip())
+                    }
                 
         # If no operators found, it's either a number or a variable
         try:
@@ -0,0 +1,348 @@
+"""
+Statement pipeline shared by the REPL (run.py) and the file runner
+(sql_runner.py): splitting SQL text into statements, parsing and IR
+generation with a per-text cache, and executing IR against a TableManager.
+"""
+from collections import OrderedDict
+import functools
+import logging
+import re
+import sys
+
+from parser.sql_parser import parser
+from IR.intermediateRepresentation import INLINED_OPERATORS, divide, generate_ir
+from IR.udf.manager import UDFManager
+from core.table_manager import TableManager
+
+_LOG = logging.getLogger(__name__)
+
+# "--" comments run to the end of the line
+_COMMENT_RE = re.compile(r'--[^\n]*')
+# A statement runs to the next ';' outside a string literal. A CREATE FUNCTION
+# runs to its closing `END;`, since its body contains semicolons of its own.
+_STATEMENT_RE = re.compile(
+    r'\s*(?:CREATE\s+FUNCTION\b.*?\bEND\s*;|(?:\'[^\']*\'|"[^"]*"|[^;\'"])+;)',
+    re.IGNORECASE | re.DOTALL,
+)
+_LINE_BREAK_RE = re.compile(r'\s*\n\s*')
+
+def split_statements(text):
+    """
+    Split SQL text into statements with "--" comments removed and each
+    statement joined onto one line. Text after the last ';' is dropped.
+    """
+    return [
+        _LINE_BREAK_RE.sub(' ', match.group().strip())
+        for match in _STATEMENT_RE.finditer(_COMMENT_RE.sub('', text))
+    ]
+
+@functools.lru_cache(maxsize=512)
+def compile_statement(sql):
+    """
+    Parse SQL text and generate the IR of each statement in it.
+
+    Returns (parse result, tuple of IRs). Results are cached per distinct
+    text; nothing downstream modifies either, so repeats can share them.
+    UDF inlining depends on the registered functions and is left to the
+    caller.
+    """
+    result = parser.parse(sql)
+    statements = result if isinstance(result, list) else [result]
+    return result, tuple(generate_ir(stmt) for stmt in statements)
+
+# Column names reach the IR as Lark NAME tokens. Token overrides __eq__, so
+# every dict lookup keyed by one goes through a Python-level comparison;
+# rows are built and read with interned plain strings instead.
+def _column_key(name):
+    return sys.intern(str(name))
+
+# Child keys that can hold column references, by expression node type.
+# Other types like literals (e.g. {'type': 'literal', 'value': 2}) don't have column dependencies
+_DEPENDENCY_CHILDREN = {
+    "arithmetic": ("left", "right"),
+    "comparison": ("left", "right"),
+    "if_stmt": ("condition", "then", "else"), # For CASE WHEN equivalent
+    "return_stmt": ("value",),
+    "inlined_expression": ("expression",),
+}
+
+# Helper function to extract column dependencies from an expression node.
+# They are added to `dependencies` if given, so a whole query is collected
+# into one set instead of a new set merged up from every node.
+def get_column_dependencies(node, actual_table_columns, dependencies=None):
+    if dependencies is None:
+        dependencies = set()
+    if isinstance(node, str): # Could be a column name or a literal from a UDF
+        # Check if it's a direct column reference
+        if node in actual_table_columns:
+            dependencies.add(_column_key(node))
+        # It could also be a literal (e.g. number, string from UDF body) - ignore for dependencies
+    elif isinstance(node, dict):
+        for key in _DEPENDENCY_CHILDREN.get(node.get("type"), ()):
+            get_column_dependencies(node.get(key), actual_table_columns, dependencies)
+    return dependencies
+
+# IR operators written differently in Python source
+_OPERATOR_SOURCE = {"=": "=="}
+SELECT_CACHE_SIZE = 256
+
+def _raise_at_eval(error):
+    # Invalid nodes only fail when a row actually reaches them, so a bad
+    # branch that no row takes does not break the whole query
+    def fail(*operands):
+        raise error
+    return fail
+
+def _bind(namespace, value):
+    # Values are bound into the generated function's globals rather than
+    # written out with repr, so tokens and literals keep their exact type
+    name = f"_c{len(namespace)}"
+    namespace[name] = value
+    return name
+
+# Translate an inlined expression into Python source evaluated against the
+# value tuple `row_data`, whose fetched columns sit at `positions`.
+# Operators compute what INLINED_OPERATORS gives for them.
+def _inlined_expr_source(expression_node, namespace, positions):
+    if isinstance(expression_node, str):
+        # Column name, or a literal string from the UDF body (e.g. 'adult')
+        position = positions.get(_column_key(expression_node))
+        if position is not None:
+            return f"row_data[{position}]"
+        return _bind(namespace, expression_node)
+    if not isinstance(expression_node, dict):
+        return _bind(namespace, expression_node) # Literal number, boolean or None
+    expr_type = expression_node.get("type")
+    if expr_type in ("arithmetic", "comparison"):
+        left = _inlined_expr_source(expression_node["left"], namespace, positions)
+        right = _inlined_expr_source(expression_node["right"], namespace, positions)
+        op = expression_node["op"]
+        if op not in INLINED_OPERATORS[expr_type]:
+            fail = _bind(namespace, _raise_at_eval(ValueError(f"Unknown {expr_type} operator: {op}")))
+            return f"{fail}({left}, {right})"
+        if op == "/":
+            return f"_divide({left}, {right})"
+        return f"({left} {_OPERATOR_SOURCE.get(op, op)} {right})"
+    if expr_type == "if_stmt": # Simulates CASE WHEN
+        condition = _inlined_expr_source(expression_node["condition"], namespace, positions)
+        then = _inlined_expr_source(expression_node["then"], namespace, positions)
+        otherwise = _inlined_expr_source(expression_node["else"], namespace, positions)
+        return f"({then} if {condition} else {otherwise})"
+    if expr_type == "return_stmt":
+        return _inlined_expr_source(expression_node["value"], namespace, positions)
+    if expr_type == "literal":
+        return _bind(namespace, expression_node["value"])
+    if expr_type == "inlined_expression":
+        return _inlined_expr_source(expression_node.get("expression"), namespace, positions)
+    fail = _bind(namespace, _raise_at_eval(ValueError(f"Unsupported expression type for evaluation: {expr_type}")))
+    return f"{fail}()"
+
+# Resolve each selected column once per query to its output alias and the
+# source computing its value from a row
+def _projection_plan(columns, namespace, positions):
+    plan = []
+    for i, col_item in enumerate(columns):
+        if isinstance(col_item, str): # Column name, usually a Lark NAME token
+            position = positions.get(_column_key(col_item))
+            plan.append((col_item, f"row_data[{position}]" if position is not None else "None"))
+        elif isinstance(col_item, dict) and col_item.get("type") == "inlined_expression":
+            # Construct alias from original function call
+            orig_call = col_item["original_function_call"]
+            arg_strings = []
+            for arg in orig_call["arguments"]:
+                if hasattr(arg, 'type') and arg.type == 'NAME': # Lark Token
+                    arg_strings.append(arg.value)
+                elif isinstance(arg, str): # A literal string arg
+                    arg_strings.append(f"'{arg}'")
+                else: # A number or other literal
+                    arg_strings.append(str(arg))
+            alias = f"{orig_call['function_name']}({', '.join(arg_strings)})"
+            plan.append((alias, _inlined_expr_source(col_item["expression"], namespace, positions)))
+        else:
+            plan.append((f"col_{i}", "None"))
+    return plan
+
+_select_cache = OrderedDict()
+
+def _compile_select(ir, fetched):
+    """
+    Generate a function specialised to a SELECT's WHERE expression and
+    columns that filters and projects a list of rows, and deduplicates
+    them for SELECT DISTINCT.
+
+    Rows are value tuples holding the columns named in `fetched`, in that
+    order, as returned by TableManager.select_from(..., as_tuples=True).
+    Returns (headers, select) where select(rows) gives the result rows as
+    value tuples in header order. Generated functions are kept in a bounded
+    LRU cache keyed by the query's columns, WHERE clause, DISTINCT flag and
+    fetched columns.
+    """
+    distinct = bool(ir.get("distinct"))
+    key = repr((ir["columns"], ir.get("where"), distinct, fetched))
+    cached = _select_cache.get(key)
+    if cached is not None:
+        _select_cache.move_to_end(key)
+        return cached
+
+    namespace = {"_divide": divide}
+    positions = {name: i for i, name in enumerate(fetched)}
+    # A repeated alias keeps its first position and its last value
+    projection = dict(_projection_plan(ir["columns"], namespace, positions))
+    where = ir.get("where")
+    condition = None
+    if isinstance(where, dict):
+        if where.get("type") == "inlined_expression":
+            condition = _inlined_expr_source(where["expression"], namespace, positions)
+        elif "type" in where:
+            condition = _inlined_expr_source(where, namespace, positions)
+
+    filter_clause = f" if {condition}" if condition is not None else ""
+    sources = list(projection.values())
+    if sources == [f"row_data[{i}]" for i in range(len(fetched))]:
+        # The fetched row already is the projected row
+        row_source = "row_data"
+    else:
+        row_source = f"({''.join(f'{source}, ' for source in sources)})"
+    if distinct:
+        # Values are kept in header order, so each row is its own dedup key.
+        # A dict comprehension keeps the first occurrence of each row in
+        # order with a single hash per row, instead of a set lookup, a set
+        # insert and a list append.
+        body = f"list({{{row_source}: None for row_data in rows{filter_clause}}})"
+    elif row_source == "row_data" and not filter_clause:
+        body = "list(rows)"
+    else:
+        body = f"[{row_source} for row_data in rows{filter_clause}]"
+    lines = [
+        "def _select(rows):",
+        f"    return {body}",
+    ]
+    exec(compile("\n".join(lines), "<select>", "exec"), namespace)
+
+    compiled = (list(projection), namespace["_select"])
+    _select_cache[key] = compiled
+    if len(_select_cache) > SELECT_CACHE_SIZE:
+        _select_cache.popitem(last=False)
+    return compiled
+
+def _execute_create_table(ir: dict, table_manager: TableManager, udf_manager: UDFManager) -> bool:
+    # Create the table
+    table_manager.create_table(ir["table"], ir["columns"])
+    print(f"Created table: {ir['table']}")
+    return True
+
+def _execute_insert(ir: dict, table_manager: TableManager, udf_manager: UDFManager) -> bool:
+    # Insert data into table
+    table_manager.insert_into(ir["table"], ir["columns"], ir["values"])
+    print(f"Inserted data into table: {ir['table']}")
+    return True
+
+def _execute_select(ir: dict, table_manager: TableManager, udf_manager: UDFManager) -> bool:
+    # Get actual column names from the table schema for dependency checking
+    actual_table_columns = frozenset()
+    try:
+        table_schema = table_manager.get_table_schema(ir["table"]) # Assuming this method exists
+        if table_schema and "columns" in table_schema:
+            actual_table_columns = frozenset(col_def["name"] for col_def in table_schema["columns"])
+    except ValueError: # Table might not exist yet or schema is malformed
+         print(f"Warning: Could not retrieve schema for table {ir['table']} for column dependency check.")
+         # Fallback or decide how to handle, for now, proceed with empty actual_table_columns
+         # This might cause issues if UDFs use columns that genuinely exist but aren't found here.
+
+    # Determine columns to fetch from the table manager
+    columns_to_fetch = set()
+    add = columns_to_fetch.add
+    for col_item in ir["columns"]:
+        if isinstance(col_item, str): # Lark NAME tokens included
+            add(_column_key(col_item))
+        elif isinstance(col_item, dict) and col_item.get("type") == "inlined_expression":
+            get_column_dependencies(col_item["expression"], actual_table_columns, columns_to_fetch)
+        # If it's a direct function_call that wasn't inlined (e.g. built-in), handle if necessary
+        # For now, assuming all relevant UDFs are inlined.
+
+    # Add dependencies from WHERE clause if it exists and is an inlined expression
+    # Note: Current IR generation for WHERE seems to simplify it or keep function calls directly.
+    # This part might need adjustment based on how WHERE clause IR is after inlining.
+    where = ir.get("where")
+    if where: # Simplified: checking top-level where
+         # Assuming where clause after inlining could also be an 'inlined_expression' or a structure needing dependency checks
+        if isinstance(where, dict): # if it's a single expression
+            get_column_dependencies(where, actual_table_columns, columns_to_fetch)
+        elif isinstance(where, list): # if it's a list of expressions (e.g. ANDed conditions)
+            for condition_node in where:
+                get_column_dependencies(condition_node, actual_table_columns, columns_to_fetch)
+
+
+    # Get raw data first
+    # Ensure all columns in columns_to_fetch are valid for the table_manager.select_from
+    # For simplicity, we're passing the discovered set. TableManager should handle unknown columns.
+    # Plain selected columns come first and in select order, so for a query
+    # selecting only plain columns each fetched row is already a result row
+    selected = dict.fromkeys(_column_key(col_item) for col_item in ir["columns"] if isinstance(col_item, str))
+    fetched = tuple(selected) + tuple(columns_to_fetch.difference(selected))
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Fetching columns from TableManager: %s", list(fetched))
+    # Rows come back as value tuples in `fetched` order, so no dict is built per row
+    raw_results = table_manager.select_from(
+        ir["table"],
+        list(fetched) if fetched else ["*"], # Fetch all if no specific columns (e.g. SELECT *)
+                                             # or if dependencies are empty (e.g. SELECT 1+1)
+        ir.get("where", []), # Pass the original where structure for now.
+                             # Filtering logic below will re-evaluate inlined UDFs in WHERE.
+        as_tuples=True
+    )
+    
+    # Process results
+    headers, select = _compile_select(ir, fetched)
+    results = select(raw_results)
+    
+    if results:
+        header_str = " | ".join(str(h) for h in headers)
+        separator = "-" * len(header_str)
+        lines = [separator, header_str, separator]
+        # A single format call per row fills in every cell
+        row_format = " | ".join(["{}"] * len(headers)).format
+        lines.extend(row_format(*row_values) for row_values in results)
+        lines.append(separator)
+        # One write for the whole table rather than a print per row
+        sys.stdout.write("\n".join(lines) + "\n")
+    else:
+        print("No results found.")
+    return True
+
+def _execute_create_function(ir: dict, table_manager: TableManager, udf_manager: UDFManager) -> bool:
+    # Create function definition
+    function_def = {
+        "name": ir["name"],
+        "params": ir["params"],
+        "return_type": ir["return_type"],
+        "body": ir["body"]
+    }
+    # Register the function with the UDF manager
+    function_name = udf_manager.register_function(function_def)
+    print(f"Created function: {function_name}")
+    return True
+
+# Handler for each IR statement type
+_DISPATCH = {
+    "create_table": _execute_create_table,
+    "insert": _execute_insert,
+    "select": _execute_select,
+    "create_function": _execute_create_function,
+}
+
+def execute_statement(ir: dict, table_manager: TableManager, udf_manager: UDFManager) -> bool:
+    """Execute a single SQL statement."""
+    try:
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Executing statement of type: %s", ir["type"])
+            _LOG.debug("Statement IR: %s", ir)
+
+        handler = _DISPATCH.get(ir["type"])
+        if handler is None:
+            raise ValueError(f"Unsupported command type: {ir['type']}")
+        return handler(ir, table_manager, udf_manager)
+
+    except Exception as e:
+        print(f"Error executing statement: {str(e)}")
+        return False
@@ -1,9 +1,17 @@
 # core/json_table.py
 import json
+import logging
 import os
 from typing import List, Dict, Any
 from core.base_table import BaseTable
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+_LOG = logging.getLogger(__name__)
+
 
 class JSONTable(BaseTable):
     """
@@ -30,7 +38,8 @@ class JSONTable(BaseTable):
         Raises:
             ValueError: If number of values does not match number of columns.
         """
-        print(f"Inserting values into table '{self.name}': {values}")
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Inserting values into table '%s': %s", self.name, values)
         if len(values) != len(self.columns):
             raise ValueError("Number of values must match number of columns.")
         self.rows.append(values)
@@ -53,13 +62,19 @@ class JSONTable(BaseTable):
         """
         os.makedirs(base_path, exist_ok=True)
         filepath = os.path.join(base_path, f"{self.name}.json")
-        print("rows to add: ", self.rows)
-        with open(filepath, "w") as f:
-            json.dump({
-                "name": self.name,
-                "columns": self.columns,
-                "rows": self.rows
-            }, f, indent=2)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("rows to add: %s", self.rows)
+        data = {
+            "name": self.name,
+            "columns": self.columns,
+            "rows": self.rows
+        }
+        if orjson is not None:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            encoded = json.dumps(data, indent=2).encode("utf-8")
+        with open(filepath, "wb") as f:
+            f.write(encoded)
 
     @staticmethod
     def load(name: str, base_path: str = "data") -> "JSONTable":
@@ -79,8 +94,9 @@ class JSONTable(BaseTable):
         filepath = os.path.join(base_path, f"{name}.json")
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"No table found at {filepath}")
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        with open(filepath, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         table = JSONTable(data["name"], data["columns"])
         table.rows = data["rows"]
         return table
@@ -1,12 +1,37 @@
 # core/sqlite_table.py
 import sqlite3
+import threading
 from typing import List, Dict, Any, Optional, Union
 from core.base_table import BaseTable
 
+DB_PATH = "db.sqlite"
+
+# SQLite connections must not be shared across threads, so each thread keeps
+# its own long-lived connection instead of reconnecting on every call.
+_tls = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Return the calling thread's connection, opening it on first use.
+
+    Connections run in autocommit mode with WAL journaling, so readers in
+    other threads are not blocked by a writer.
+    """
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, isolation_level=None)
+        conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
+        _tls.conn = conn
+    return conn
+
 
 class SQLiteTable(BaseTable):
     """
     Implementation of BaseTable using SQLite for persistent storage.
+
+    Every method goes through a per-thread connection, so a table may be read
+    concurrently from several threads (e.g. a thread pool running queries).
     
     Attributes:
         name: Name of the table.
@@ -23,8 +48,7 @@ class SQLiteTable(BaseTable):
     def _create_table(self):
         """Create the table if it doesn't already exist."""
         col_defs = ", ".join([f"{col} {self.col_types[col]}" for col in self.columns])
-        with sqlite3.connect("db.sqlite") as conn:
-            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.name} ({col_defs})")
+        _get_conn().execute(f"CREATE TABLE IF NOT EXISTS {self.name} ({col_defs})")
 
     def insert(self, values: List[Any]) -> None:
         """
@@ -39,10 +63,9 @@ class SQLiteTable(BaseTable):
         if len(values) != len(self.columns):
             raise ValueError("Number of values must match number of columns.")
         placeholders = ", ".join(["?"] * len(values))
-        with sqlite3.connect("db.sqlite") as conn:
-            conn.execute(
-                f"INSERT INTO {self.name} VALUES ({placeholders})", values
-            )
+        _get_conn().execute(
+            f"INSERT INTO {self.name} VALUES ({placeholders})", values
+        )
 
     def select_all(self) -> List[Dict[str, Any]]:
         """
@@ -51,11 +74,8 @@ class SQLiteTable(BaseTable):
         Returns:
             List of dictionaries representing each row.
         """
-        with sqlite3.connect("db.sqlite") as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT * FROM {self.name}")
-            rows = cursor.fetchall()
-            return [dict(zip(self.columns, row)) for row in rows]
+        rows = _get_conn().execute(f"SELECT * FROM {self.name}").fetchall()
+        return [dict(zip(self.columns, row)) for row in rows]
 
     def update(self, set_values: Dict[str, Any], where_clause: str, params: tuple) -> None:
         """
@@ -68,8 +88,7 @@ class SQLiteTable(BaseTable):
         """
         set_clause = ", ".join([f"{key} = ?" for key in set_values.keys()])
         full_sql = f"UPDATE {self.name} SET {set_clause} WHERE {where_clause}"
-        with sqlite3.connect("db.sqlite") as conn:
-            conn.execute(full_sql, tuple(set_values.values()) + params)
+        _get_conn().execute(full_sql, tuple(set_values.values()) + params)
 
     def delete(self, where_clause: str, params: tuple) -> None:
         """
@@ -79,8 +98,7 @@ class SQLiteTable(BaseTable):
             where_clause: SQL WHERE clause (e.g., "id = ?").
             params: Tuple of parameters for WHERE clause.
         """
-        with sqlite3.connect("db.sqlite") as conn:
-            conn.execute(f"DELETE FROM {self.name} WHERE {where_clause}", params)
+        _get_conn().execute(f"DELETE FROM {self.name} WHERE {where_clause}", params)
 
     def save(self) -> None:
         """
@@ -103,20 +121,17 @@ class SQLiteTable(BaseTable):
         Raises:
             ValueError: If table doesn't exist.
         """
-        with sqlite3.connect("db.sqlite") as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({name})")
-            info = cursor.fetchall()
-            if not info:
-                raise ValueError(f"Table '{name}' does not exist in the database.")
-            columns = [row[1] for row in info]
-            col_types = {row[1]: row[2].upper() for row in info}
-            return SQLiteTable(name, columns, col_types)
+        info = _get_conn().execute(f"PRAGMA table_info({name})").fetchall()
+        if not info:
+            raise ValueError(f"Table '{name}' does not exist in the database.")
+        columns = [row[1] for row in info]
+        col_types = {row[1]: row[2].upper() for row in info}
+        return SQLiteTable(name, columns, col_types)
 
     @staticmethod
     def exists(name: str) -> bool:
         """Check if a table exists in the database."""
-        with sqlite3.connect("db.sqlite") as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (name,))
-            return cursor.fetchone() is not None
\ No newline at end of file
+        cursor = _get_conn().execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (name,)
+        )
+        return cursor.fetchone() is not None
\ No newline at end of file
@@ -1,14 +1,79 @@
 import os
 import json
-from typing import Dict, List, Any
+import operator
+from collections import defaultdict
+from itertools import compress, repeat
+from typing import BinaryIO, Dict, List, Any, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, pretty-printed with 2 spaces if indent."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+# Conversions applied once per value when a table is loaded from disk.
+_LOAD_CASTS = {"INT": int, "FLOAT": float}
+
+# Comparison operators supported in where clauses.
+_WHERE_OPS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le
+}
+
+# Expected selectivity of each operator, most selective first. ANDed
+# predicates are evaluated in this order so later ones see fewer rows.
+_SELECTIVITY_RANK = {"=": 0, "<": 1, ">": 1, "<=": 2, ">=": 2, "!=": 3}
+
+# Per-type value checks used to validate inserts. NULL is valid everywhere.
+_TYPE_CHECKERS = {
+    "INT": lambda v: v is None or isinstance(v, int),
+    "FLOAT": lambda v: v is None or isinstance(v, (int, float)),
+    "TEXT": lambda v: v is None or isinstance(v, str),
+}
+
+
+def _unknown_type(value: Any) -> bool:
+    return value is None
+
 
 class TableManager:
-    """Manages table storage and operations using JSON files."""
+    """
+    Manages table storage and operations using JSON files.
+
+    On disk each table keeps the row-oriented {"name", "columns", "rows"}
+    layout. In memory the rows are transposed into one list per column
+    (``table["columns_data"][name]``) so scans only touch the columns a
+    query references.
+
+    Inserted rows are appended to a ``<table>.log.jsonl`` sidecar instead of
+    rewriting the whole table file. The log is folded back into the table
+    file by ``flush()``, which runs automatically every ``compact_every``
+    logged rows, and is replayed on load if it was never flushed.
+    """
     
-    def __init__(self, data_dir: str = "data/tables"):
+    def __init__(self, data_dir: str = "data/tables", compact_every: int = 1000):
         """Initialize the table manager with a data directory."""
         self.data_dir = data_dir
+        self.compact_every = compact_every
         os.makedirs(data_dir, exist_ok=True)
+        self._log_handles: Dict[str, BinaryIO] = {}
+        self._logged_rows: Dict[str, int] = {}
+        # (table, column) -> value -> ids of the rows holding that value
+        self.indexes: Dict[Tuple[str, str], Dict[Any, List[int]]] = {}
         self.tables: Dict[str, Dict] = self._load_tables()
         
     def _load_tables(self) -> Dict[str, Dict]:
@@ -19,9 +84,77 @@ class TableManager:
                 if filename.endswith('.json'):
                     table_name = filename[:-5]  # Remove .json
                     filepath = os.path.join(self.data_dir, filename)
-                    with open(filepath, 'r') as f:
-                        tables[table_name] = json.load(f)
+                    with open(filepath, 'rb') as f:
+                        tables[table_name] = self._to_columnar(_json_loads(f.read()))
+                    self._replay_log(table_name, tables[table_name])
         return tables
+
+    def _log_path(self, name: str) -> str:
+        return os.path.join(self.data_dir, f"{name}.log.jsonl")
+
+    def _replay_log(self, name: str, table: Dict) -> None:
+        """Apply rows left in a table's insert log by a previous session."""
+        log_path = self._log_path(name)
+        if not os.path.exists(log_path):
+            return
+        casts = [_LOAD_CASTS.get(col["datatype"]) for col in table["columns"]]
+        replayed = 0
+        with open(log_path, 'rb') as f:
+            for line in f:
+                try:
+                    row = _json_loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write
+                    break
+                row = [v if cast is None or v is None else cast(v) for cast, v in zip(casts, row)]
+                self._append_row(table, row)
+                replayed += 1
+        self._logged_rows[name] = replayed
+
+    @staticmethod
+    def _to_columnar(stored: Dict) -> Dict:
+        """Transpose a table read from disk into its in-memory column layout."""
+        rows = stored.get("rows", [])
+        columns_data = {}
+        for i, col_def in enumerate(stored["columns"]):
+            values = [row[i] for row in rows]
+            cast = _LOAD_CASTS.get(col_def["datatype"])
+            # JSON keeps numbers typed, so a column is only rebuilt when it
+            # holds other values (e.g. ints stored in a FLOAT column)
+            if cast is not None and not all(v is None or type(v) is cast for v in values):
+                values = [None if v is None else cast(v) for v in values]
+            columns_data[col_def["name"]] = values
+        table = {
+            "name": stored["name"],
+            "columns": stored["columns"],
+            "columns_data": columns_data,
+            "row_count": len(rows)
+        }
+        TableManager._index_schema(table)
+        return table
+
+    @staticmethod
+    def _index_schema(table: Dict) -> None:
+        """Cache per-column lookups derived from the table schema."""
+        table["_col_names"] = [col["name"] for col in table["columns"]]
+        table["_col_index"] = {col["name"]: i for i, col in enumerate(table["columns"])}
+        table["_col_types"] = {col["name"]: col["datatype"] for col in table["columns"]}
+        table["_validators"] = [_TYPE_CHECKERS.get(col["datatype"], _unknown_type)
+                                for col in table["columns"]]
+
+    def _save_table(self, name: str) -> None:
+        """Write a table back to disk in the row-oriented JSON layout."""
+        table = self.tables[name]
+        columns_data = table["columns_data"]
+        column_values = [columns_data[name] for name in table["_col_names"]]
+        table_data = {
+            "name": table["name"],
+            "columns": table["columns"],
+            "rows": [list(row) for row in zip(*column_values)]
+        }
+        filepath = os.path.join(self.data_dir, f"{name}.json")
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps(table_data, indent=True))
         
     def create_table(self, name: str, columns: List[Dict[str, str]]) -> None:
         """
@@ -37,16 +170,16 @@ class TableManager:
         table_data = {
             "name": name,
             "columns": columns,
-            "rows": []
+            "columns_data": {col["name"]: [] for col in columns},
+            "row_count": 0
         }
+        self._index_schema(table_data)
         
         # Save to memory
         self.tables[name] = table_data
         
         # Save to disk
-        filepath = os.path.join(self.data_dir, f"{name}.json")
-        with open(filepath, 'w') as f:
-            json.dump(table_data, f, indent=2)
+        self._save_table(name)
             
     def insert_into(self, table_name: str, columns: List[str], values: List[Any]) -> None:
         """
@@ -57,38 +190,108 @@ class TableManager:
             columns: List of column names
             values: List of values to insert
         """
+        self.insert_batch(table_name, columns, [values])
+
+    def insert_batch(self, table_name: str, columns: List[str], rows: List[List[Any]]) -> None:
+        """
+        Insert several rows into a table with a single log write.
+
+        Every row is validated before any is inserted, so a bad row leaves
+        the table unchanged.
+
+        Args:
+            table_name: Name of the table
+            columns: List of column names, shared by all rows
+            rows: List of value lists, one per row
+        """
         if table_name not in self.tables:
             raise ValueError(f"Table '{table_name}' does not exist")
-            
+
         table = self.tables[table_name]
-        
-        # Validate columns
-        table_columns = {col["name"]: col["datatype"] for col in table["columns"]}
+        targets = self._insert_targets(table, columns)
+        width = len(table["columns"])
+        full_rows = [self._build_row(targets, width, values) for values in rows]
+        first_row_id = table["row_count"]
+        for row in full_rows:
+            self._append_row(table, row)
+
+        for (indexed_table, column), index in self.indexes.items():
+            if indexed_table == table_name:
+                position = table["_col_index"][column]
+                for row_id, row in enumerate(full_rows, first_row_id):
+                    index[row[position]].append(row_id)
+
+        log = self._log_handles.get(table_name)
+        if log is None:
+            log = open(self._log_path(table_name), 'ab')
+            self._log_handles[table_name] = log
+        log.write(b"".join(_json_dumps(row) + b"\n" for row in full_rows))
+        log.flush()
+
+        self._logged_rows[table_name] = self._logged_rows.get(table_name, 0) + len(full_rows)
+        if self._logged_rows[table_name] >= self.compact_every:
+            self.flush(table_name)
+
+    @staticmethod
+    def _insert_targets(table: Dict, columns: List[str]) -> List[tuple]:
+        """Resolve insert columns to (name, position, validator, type, cast) once per batch."""
+        col_index = table["_col_index"]
+        col_types = table["_col_types"]
+        validators = table["_validators"]
+        targets = []
         for col in columns:
-            if col not in table_columns:
-                raise ValueError(f"Column '{col}' does not exist in table '{table_name}'")
-                
+            if col not in col_index:
+                raise ValueError(f"Column '{col}' does not exist in table '{table['name']}'")
+            position = col_index[col]
+            datatype = col_types[col]
+            targets.append((col, position, validators[position], datatype, _LOAD_CASTS.get(datatype)))
+        return targets
+
+    @staticmethod
+    def _build_row(targets: List[tuple], width: int, values: List[Any]) -> List[Any]:
+        """Validate one insert and return the full row in schema order."""
         # Create a full row with all columns (NULL for missing values)
-        row = [None] * len(table["columns"])
-        for col, val in zip(columns, values):
-            # Find column index
-            for i, col_def in enumerate(table["columns"]):
-                if col_def["name"] == col:
-                    # Validate data type
-                    if not self._validate_type(val, col_def["datatype"]):
-                        raise ValueError(f"Invalid value type for column '{col}': expected {col_def['datatype']}")
-                    row[i] = val
-                    break
-                    
-        # Add row to table
-        table["rows"].append(row)
-        
-        # Save to disk
-        filepath = os.path.join(self.data_dir, f"{table_name}.json")
-        with open(filepath, 'w') as f:
-            json.dump(table, f, indent=2)
+        row = [None] * width
+        for (col, position, is_valid, datatype, cast), val in zip(targets, values):
+            if not is_valid(val):
+                raise ValueError(f"Invalid value type for column '{col}': expected {datatype}")
+            # Stored with the type a reload would give it, e.g. 10 as 10.0 in a FLOAT column
+            row[position] = val if cast is None or val is None else cast(val)
+
+        return row
+
+    @staticmethod
+    def _append_row(table: Dict, row: List[Any]) -> None:
+        """Append a full row to the in-memory column lists."""
+        columns_data = table["columns_data"]
+        for name, value in zip(table["_col_names"], row):
+            columns_data[name].append(value)
+        table["row_count"] += 1
+
+    def flush(self, table_name: Optional[str] = None) -> None:
+        """
+        Rewrite table files from memory and truncate their insert logs.
+
+        Args:
+            table_name: Table to flush (None for every table with logged rows)
+        """
+        names = [table_name] if table_name is not None else list(self._logged_rows)
+        for name in names:
+            log = self._log_handles.pop(name, None)
+            if log is not None:
+                log.close()
+            if self._logged_rows.pop(name, 0):
+                self._save_table(name)
+            if os.path.exists(self._log_path(name)):
+                os.remove(self._log_path(name))
+
+    def close(self) -> None:
+        """Flush all pending inserts and release the log files."""
+        self.flush()
             
-    def select_from(self, table_name: str, columns: List[str] = None, where: Dict = None) -> List[Dict[str, Any]]:
+    def select_from(self, table_name: str, columns: List[str] = None, where: Dict = None,
+                    count_only: bool = False,
+                    as_tuples: bool = False) -> Union[List[Dict[str, Any]], List[Tuple], int]:
         """
         Select data from a table.
         
@@ -96,90 +299,173 @@ class TableManager:
             table_name: Name of the table
             columns: List of columns to select (None for all)
             where: Where clause conditions
+            count_only: Return only the number of matching rows, without
+                building any row dictionaries
+            as_tuples: Return each row as a tuple of values in the order of
+                columns rather than as a dictionary
             
         Returns:
-            List of rows as dictionaries
+            List of rows as dictionaries (tuples if as_tuples), or the row
+            count if count_only
         """
         if table_name not in self.tables:
             raise ValueError(f"Table '{table_name}' does not exist")
             
         table = self.tables[table_name]
-        table_columns = [col["name"] for col in table["columns"]]
-        column_types = {col["name"]: col["datatype"] for col in table["columns"]}
+        columns_data = table["columns_data"]
         
         # If no columns specified, select all
         if not columns:
-            columns = table_columns
+            columns = table["_col_names"]
             
         # Validate requested columns
         for col in columns:
-            if col not in table_columns:
+            if col not in columns_data:
                 raise ValueError(f"Column '{col}' does not exist in table '{table_name}'")
+
+        row_ids = self._index_lookup(table_name, where)
+
+        if count_only:
+            if not where:
+                return table["row_count"]
+            if row_ids is not None:
+                return len(row_ids)
+            return sum(self._evaluate_where_vectorized(where, table))
                 
-        # Convert rows to dictionaries
-        result = []
-        for row in table["rows"]:
-            row_dict = {}
-            for col_name, value in zip(table_columns, row):
-                # Convert value to the correct type
-                if value is not None:
-                    col_type = column_types[col_name]
-                    if col_type == "INT":
-                        value = int(value)
-                    elif col_type == "FLOAT":
-                        value = float(value)
-                row_dict[col_name] = value
-            
-            # Apply where clause if present
-            if where:
-                if not self._evaluate_where(where, row_dict):
-                    continue
-                    
-            # Select only requested columns
-            result.append({col: row_dict[col] for col in columns})
-            
-        return result
+        selected = [columns_data[col] for col in columns]
+        if row_ids is not None:
+            # Gather just the matching positions of each column
+            selected = [[values[i] for i in row_ids] for values in selected]
+            rows = zip(*selected)
+        elif not where:
+            rows = zip(*selected)
+        else:
+            rows = compress(zip(*selected), self._evaluate_where_vectorized(where, table))
+
+        if as_tuples:
+            return list(rows)
+        return [dict(zip(columns, values)) for values in rows]
         
+    def create_index(self, table_name: str, column: str) -> None:
+        """
+        Build a hash index on a column for equality lookups.
+
+        select_from and count_from use the index when the where clause is a
+        single ``column = value`` comparison on an indexed column, instead
+        of scanning the table. The index is kept up to date on insert.
+
+        Args:
+            table_name: Name of the table
+            column: Name of the column to index
+        """
+        if table_name not in self.tables:
+            raise ValueError(f"Table '{table_name}' does not exist")
+        table = self.tables[table_name]
+        if column not in table["columns_data"]:
+            raise ValueError(f"Column '{column}' does not exist in table '{table_name}'")
+
+        index = defaultdict(list)
+        for row_id, value in enumerate(table["columns_data"][column]):
+            index[value].append(row_id)
+        self.indexes[(table_name, column)] = index
+
+    def _index_lookup(self, table_name: str, where: Any) -> Optional[List[int]]:
+        """Return matching row ids from an index, or None if no index applies."""
+        if not self.indexes or not isinstance(where, dict) or where.get("op") != "=":
+            return None
+        left = where.get("left")
+        if not isinstance(left, str):
+            return None
+        index = self.indexes.get((table_name, left))
+        if index is None:
+            return None
+        try:
+            return index.get(where["right"], [])
+        except TypeError:
+            # Unhashable literal; let the scan handle it
+            return None
+
+    def count_from(self, table_name: str, where: Dict = None) -> int:
+        """
+        Count the rows of a table that satisfy a where clause.
+
+        Args:
+            table_name: Name of the table
+            where: Where clause conditions (None to count every row)
+
+        Returns:
+            Number of matching rows
+        """
+        return self.select_from(table_name, where=where, count_only=True)
+
     def _validate_type(self, value: Any, expected_type: str) -> bool:
         """Validate that a value matches the expected SQL type."""
-        if value is None:
-            return True
-            
-        if expected_type == "INT":
-            return isinstance(value, int)
-        elif expected_type == "FLOAT":
-            return isinstance(value, (int, float))
-        elif expected_type == "TEXT":
-            return isinstance(value, str)
-        return False
+        return _TYPE_CHECKERS.get(expected_type, _unknown_type)(value)
         
-    def _evaluate_where(self, where: Dict, row: Dict[str, Any]) -> bool:
-        """Evaluate a where clause against a row."""
-        if not where:
-            return True
-            
+    def _evaluate_where_vectorized(self, where: Union[Dict, List[Dict]], table: Dict) -> List[bool]:
+        """
+        Evaluate a where clause against a whole table at once.
+
+        Each comparison is applied to the referenced column in a single
+        ``map`` call instead of dispatching on the operator for every row.
+        A list of comparisons is combined with AND: they are ordered by
+        expected selectivity, each one only sees the rows that passed the
+        previous ones, and evaluation stops once no rows remain.
+
+        Returns:
+            One boolean per row, True where the row satisfies the clause
+        """
+        columns_data = table["columns_data"]
+        row_count = table["row_count"]
+        if isinstance(where, dict):
+            return self._evaluate_predicate(where, columns_data, row_count)
+
+        col_types = table["_col_types"]
+        predicates = sorted(where, key=lambda p: self._predicate_rank(p, col_types))
+        alive = list(compress(range(row_count),
+                              self._evaluate_predicate(predicates[0], columns_data, row_count)))
+        for predicate in predicates[1:]:
+            if not alive:
+                break
+            alive = list(compress(alive, self._evaluate_predicate(
+                predicate, columns_data, len(alive), alive)))
+
+        mask = [False] * row_count
+        for i in alive:
+            mask[i] = True
+        return mask
+
+    @staticmethod
+    def _predicate_rank(predicate: Dict, col_types: Dict[str, str]) -> tuple:
+        """Sort key placing selective operators and numeric columns first."""
+        left = predicate["left"]
+        col_type = col_types.get(left) if isinstance(left, str) else None
+        return (_SELECTIVITY_RANK.get(predicate["op"], len(_SELECTIVITY_RANK)),
+                0 if col_type in ("INT", "FLOAT") else 1)
+
+    def _evaluate_predicate(self, where: Dict, columns_data: Dict[str, List[Any]],
+                            row_count: int, rows: Optional[List[int]] = None) -> List[bool]:
+        """
+        Evaluate one comparison over a column, or over the given rows of it.
+
+        Returns:
+            One boolean per evaluated row
+        """
         left = where["left"]
         op = where["op"]
         right = where["right"]
-        
-        # Get left value (could be column name or literal)
-        left_val = row.get(left, left) if isinstance(left, str) else left
-        
-        # Compare values
-        if op == "=":
-            return left_val == right
-        elif op == "!=":
-            return left_val != right
-        elif op == ">":
-            return left_val > right
-        elif op == "<":
-            return left_val < right
-        elif op == ">=":
-            return left_val >= right
-        elif op == "<=":
-            return left_val <= right
-        else:
+
+        compare = _WHERE_OPS.get(op)
+        if compare is None:
             raise ValueError(f"Unsupported operator: {op}")
+
+        # Left side may be a column name or a literal
+        if isinstance(left, str) and left in columns_data:
+            values = columns_data[left]
+            if rows is not None:
+                values = [values[i] for i in rows]
+            return list(map(compare, values, repeat(right)))
+        return [compare(left, right)] * row_count
             
     def table_exists(self, name: str) -> bool:
         """Check if a table exists."""
@@ -1,5 +1,23 @@
-from collections import defaultdict
-from table_loader import tables
+import ast
+import functools
+import heapq
+import operator
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from itertools import compress, repeat
+from table_loader import list_tables, tables
+
+ALLOWED_BUILTINS = {
+    "min": min, "max": max, "abs": abs, "round": round,
+    "int": int, "float": float, "bool": bool, "str": str
+}
+
+# Prepared SELECT plans keyed by statement text. Each plan records the schema
+# version it was built against; DDL bumps the version so stale plans miss.
+PLAN_CACHE_SIZE = 512
+PreparedPlan = namedtuple("PreparedPlan", ["ir", "schema", "where", "lookup", "projection",
+                                           "schema_version"])
+_plan_cache = OrderedDict()
+_schema_version = 0
 
 def fetch_table_rows(table_name):
     if table_name not in tables:
@@ -8,28 +26,177 @@ def fetch_table_rows(table_name):
     rows = tables[table_name]["rows"]
     return schema, rows
 
-def safe_eval(expr, row_dict):
-    allowed_builtins = {
-        "min": min, "max": max, "abs": abs, "round": round,
-        "int": int, "float": float, "bool": bool, "str": str
-    }
+def column_positions(table_name):
+    """
+    Return the table's {column: position} map.
+
+    It is stored on the table when created, or computed once for tables
+    loaded from disk, so DML statements do not rebuild it per call.
+    """
+    table = tables[table_name]
+    col_idx = table.get("col_idx")
+    if col_idx is None:
+        col_idx = table["col_idx"] = {col: i for i, col in enumerate(table["columns"])}
+    return col_idx
+
+class _ColumnsToPositions(ast.NodeTransformer):
+    """Rewrite column names into subscripts of the row list."""
+
+    def __init__(self, positions):
+        self.positions = positions
+
+    def visit_Name(self, node):
+        pos = self.positions.get(node.id)
+        if pos is None:
+            return node
+        return ast.copy_location(
+            ast.Subscript(value=ast.Name(id="_row", ctx=ast.Load()),
+                          slice=ast.Constant(pos), ctx=ast.Load()),
+            node
+        )
 
-    # Replace dots in keys to make them valid identifiers
-    safe_row_dict = {k.replace('.', '_'): v for k, v in row_dict.items()}
-    expr = expr.replace('.', '_')  # Update expression accordingly
+_COMPARE_OPS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Is: operator.is_, ast.IsNot: operator.is_not,
+}
 
+def _literal(node):
     try:
-        return eval(expr, {"__builtins__": allowed_builtins}, safe_row_dict)
+        return True, ast.literal_eval(node)
+    except ValueError:
+        return False, None
+
+def _compile_column_batch(node, positions):
+    """
+    Return a whole-column evaluator for the simplest expression shapes.
+
+    A bare column or a comparison between a column and a literal is run as a
+    map over the rows with a C-level getter and operator, so no Python frame
+    is entered per row. Anything else returns None.
+    """
+    if isinstance(node, ast.Name) and node.id in positions:
+        getter = operator.itemgetter(positions[node.id])
+        return lambda rows: list(map(getter, rows))
+
+    if isinstance(node, ast.Compare) and len(node.ops) == 1:
+        op = _COMPARE_OPS.get(type(node.ops[0]))
+        left, right = node.left, node.comparators[0]
+        if op is None:
+            return None
+        if isinstance(left, ast.Name) and left.id in positions:
+            is_literal, value = _literal(right)
+            if is_literal:
+                getter = operator.itemgetter(positions[left.id])
+                return lambda rows: list(map(op, map(getter, rows), repeat(value)))
+        if isinstance(right, ast.Name) and right.id in positions:
+            is_literal, value = _literal(left)
+            if is_literal:
+                getter = operator.itemgetter(positions[right.id])
+                return lambda rows: list(map(op, repeat(value), map(getter, rows)))
+    return None
+
+@functools.lru_cache(maxsize=1024)
+def _compile_row_expr(expr, schema):
+    positions = {col.replace('.', '_'): i for i, col in enumerate(schema)}
+    try:
+        tree = ast.parse(expr, "<expr>", mode="eval")
     except Exception as e:
         raise RuntimeError(f"Failed to evaluate expression '{expr}': {e}")
+    batch = _compile_column_batch(tree.body, positions)
+    if batch is not None:
+        return expr, batch
+
+    body = _ColumnsToPositions(positions).visit(tree.body)
+    func = ast.Expression(ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg="_row")], kwonlyargs=[],
+                           kw_defaults=[], defaults=[]),
+        body=body
+    ))
+    code = compile(ast.fix_missing_locations(func), "<expr>", "eval")
+    row_func = eval(code, {"__builtins__": ALLOWED_BUILTINS})
+    return expr, lambda rows: list(map(row_func, rows))
+
+def compile_row_expr(expr, schema):
+    """
+    Compile an expression into a function over a batch of row lists.
+
+    Column names are resolved to row positions once, so evaluating the
+    expression needs neither a per-row dict nor a per-row parse. The
+    function returns the expression's value for every row, in order.
+    """
+    return _compile_row_expr(expr.replace('.', '_'), tuple(schema))
+
+# Operators of the parser's structured comparison and arithmetic IR nodes
+IR_COMPARE_OPS = {
+    "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+}
+IR_ARITH_OPS = {
+    "+": operator.add, "-": operator.sub,
+    "*": operator.mul, "/": operator.truediv,
+}
+
+def _ir_operator(table, op):
+    func = table.get(op)
+    if func is None:
+        raise ValueError(f"Unsupported operator: {op}")
+    return func
+
+def _compile_ir_operand(node, col_idx):
+    """Compile a comparison operand into a function from rows to its values."""
+    if isinstance(node, dict):
+        if node.get("type") != "arithmetic":
+            raise NotImplementedError(f"Unsupported operand in condition: {node.get('type')}")
+        func = _ir_operator(IR_ARITH_OPS, node["op"])
+        left = _compile_ir_operand(node["left"], col_idx)
+        right = _compile_ir_operand(node["right"], col_idx)
+        return lambda rows: list(map(func, left(rows), right(rows)))
+    if isinstance(node, str) and node in col_idx:
+        getter = operator.itemgetter(col_idx[node])
+        return lambda rows: list(map(getter, rows))
+    return lambda rows: [node] * len(rows)
+
+def _compile_ir_comparison(cond_expr, schema):
+    """
+    Compile a {"type": "comparison"} IR node into a batch predicate.
+
+    Operands that name a column read that column; anything else is a
+    literal. The comparison runs through operator functions, so neither
+    eval() nor the ast compiler is involved.
+    """
+    col_idx = {col: i for i, col in enumerate(schema)}
+    compare = _ir_operator(IR_COMPARE_OPS, cond_expr["op"])
+    left = _compile_ir_operand(cond_expr["left"], col_idx)
+    right = _compile_ir_operand(cond_expr["right"], col_idx)
+    return repr(cond_expr), lambda rows: list(map(compare, left(rows), right(rows)))
 
-
-def evaluate_condition(cond_expr, row_dict):
+def compile_condition(cond_expr, schema):
     if cond_expr is None:
-        return True
-    if isinstance(cond_expr, dict) and cond_expr.get("type") == "subquery":
-        raise NotImplementedError("Subqueries not supported in this version.")
-    return bool(safe_eval(cond_expr, row_dict))
+        return None
+    if isinstance(cond_expr, dict):
+        if cond_expr.get("type") == "comparison":
+            return _compile_ir_comparison(cond_expr, schema)
+        if cond_expr.get("type") == "subquery":
+            raise NotImplementedError("Subqueries not supported in this version.")
+    return compile_row_expr(cond_expr, schema)
+
+def eval_rows(compiled, rows):
+    """Evaluate a compiled row expression over every row."""
+    expr, batch = compiled
+    try:
+        return batch(rows)
+    except Exception as e:
+        raise RuntimeError(f"Failed to evaluate expression '{expr}': {e}")
+
+def _key_getter(positions):
+    # itemgetter yields a bare value for one position and a tuple for several;
+    # either works as a hash key as long as both sides of the join agree
+    if not positions:
+        return lambda row: ()
+    return operator.itemgetter(*positions)
 
 def join_tables(left_table_name, left_schema, left_rows,
                 right_table_name, right_schema, right_rows,
@@ -38,82 +205,155 @@ def join_tables(left_table_name, left_schema, left_rows,
     right_schema_prefixed = [f"{right_table_name}.{col}" for col in right_schema]
     joined_schema = left_schema_prefixed + right_schema_prefixed
 
-    right_index = defaultdict(list)
-    right_key_positions = [right_schema.index(rcol) for _, rcol in join_keys]
-    left_key_positions = [left_schema.index(lcol) for lcol, _ in join_keys]
+    left_idx = {col: i for i, col in enumerate(left_schema)}
+    right_idx = {col: i for i, col in enumerate(right_schema)}
+    for lcol, rcol in join_keys:
+        if lcol not in left_idx:
+            raise ValueError(f"Column '{lcol}' not found.")
+        if rcol not in right_idx:
+            raise ValueError(f"Column '{rcol}' not found.")
+    left_key = _key_getter([left_idx[lcol] for lcol, _ in join_keys])
+    right_key = _key_getter([right_idx[rcol] for _, rcol in join_keys])
 
+    right_index = defaultdict(list)
     for rrow in right_rows:
-        key = tuple(rrow[pos] for pos in right_key_positions)
-        right_index[key].append(rrow)
+        right_index[right_key(rrow)].append(rrow)
 
+    # Joined rows are plain lists laid out as joined_schema; dicts are only
+    # built for the final result
+    null_right = [None] * len(right_schema)
     joined_rows = []
-    for lrow in left_rows:
-        key = tuple(lrow[pos] for pos in left_key_positions)
-        matched_rows = right_index.get(key, [])
+    for lrow, key in zip(left_rows, map(left_key, left_rows)):
+        matched_rows = right_index.get(key)
         if matched_rows:
             for rrow in matched_rows:
-                row_dict = {f"{left_table_name}.{col}": val for col, val in zip(left_schema, lrow)}
-                row_dict.update({f"{right_table_name}.{col}": val for col, val in zip(right_schema, rrow)})
-                joined_rows.append(row_dict)
+                joined_rows.append([*lrow, *rrow])
         elif join_type == "left":
-            row_dict = {f"{left_table_name}.{col}": val for col, val in zip(left_schema, lrow)}
-            row_dict.update({f"{right_table_name}.{col}": None for col in right_schema})
-            joined_rows.append(row_dict)
+            joined_rows.append([*lrow, *null_right])
 
     return joined_schema, joined_rows
 
+# Grouped reducers: each takes the group key of every row alongside one
+# aggregate input column and folds them in a single pass into one
+# accumulator per group, so no per-group value lists are materialized
+def _sum_by(keys, values):
+    sums = {}
+    get = sums.get
+    for key, val in zip(keys, values):
+        sums[key] = get(key, 0) + val
+    return sums
+
+def _count_by(keys, values):
+    return Counter(keys)
+
+def _avg_by(keys, values):
+    counts = _count_by(keys, values)
+    return {key: total / counts[key] for key, total in _sum_by(keys, values).items()}
+
+def _min_by(keys, values):
+    mins = {}
+    for key, val in zip(keys, values):
+        if key not in mins or val < mins[key]:
+            mins[key] = val
+    return mins
+
+def _max_by(keys, values):
+    maxes = {}
+    for key, val in zip(keys, values):
+        if key not in maxes or val > maxes[key]:
+            maxes[key] = val
+    return maxes
+
+AGGREGATES = {
+    "SUM": _sum_by,
+    "COUNT": _count_by,
+    "AVG": _avg_by,
+    "MIN": _min_by,
+    "MAX": _max_by,
+}
+
 def group_by(rows, schema, group_cols, agg_columns):
     col_idx = {c: i for i, c in enumerate(schema)}
-    groups = defaultdict(list)
-    for row in rows:
-        key = tuple(row[col_idx[c]] for c in group_cols)
-        groups[key].append(row)
-
-    result_rows = []
-    for key_vals, group_rows in groups.items():
-        agg_results = {}
-        for agg in agg_columns:
-            expr = agg["expr"]
-            alias = agg["alias"]
-            agg_type = agg["agg"].upper()
-
-            vals = [safe_eval(expr, {col: row[col_idx[col]] for col in schema}) for row in group_rows]
-
-            if agg_type == "SUM":
-                agg_val = sum(vals)
-            elif agg_type == "COUNT":
-                agg_val = len(vals)
-            elif agg_type == "AVG":
-                agg_val = sum(vals) / len(vals) if vals else 0
-            elif agg_type == "MIN":
-                agg_val = min(vals)
-            elif agg_type == "MAX":
-                agg_val = max(vals)
-            else:
-                raise NotImplementedError(f"Aggregate {agg_type} not supported")
-
-            agg_results[alias] = agg_val
-
-        result_rows.append(list(key_vals) + [agg_results[agg["alias"]] for agg in agg_columns])
+
+    # Resolve each aggregate function once rather than per group
+    agg_funcs = []
+    for agg in agg_columns:
+        agg_type = agg["agg"].upper()
+        if agg_type not in AGGREGATES:
+            raise NotImplementedError(f"Aggregate {agg_type} not supported")
+        agg_funcs.append(AGGREGATES[agg_type])
+
+    # Group keys and aggregate inputs are each extracted once per column;
+    # groups keep the order in which their key first appears
+    keys = list(zip(*[map(operator.itemgetter(col_idx[c]), rows) for c in group_cols]))
+    agg_results = [
+        agg_func(keys, eval_rows(compile_row_expr(agg["expr"], schema), rows))
+        for agg_func, agg in zip(agg_funcs, agg_columns)
+    ]
+
+    result_rows = [
+        list(key_vals) + [results[key_vals] for results in agg_results]
+        for key_vals in dict.fromkeys(keys)
+    ]
 
     result_schema = group_cols + [agg["alias"] for agg in agg_columns]
     return result_schema, result_rows
 
-def evaluate_columns(rows, schema, columns):
-    results = []
-    for row in rows:
-        row_dict = dict(zip(schema, row))
-        result_row = {}
-        for col in columns:
-            val = safe_eval(col["expr"], row_dict)
-            alias = col.get("alias") or col["expr"]
-            result_row[alias] = val
-        results.append(result_row)
-    return results
-
-def order_by(rows, order_cols):
-    for col, asc in reversed(order_cols):
-        rows.sort(key=lambda r: r.get(col), reverse=not asc)
+def project_columns(rows, projection):
+    """
+    Evaluate a projection into (aliases, rows) with each row a value list.
+
+    A repeated alias keeps its first position and its last expression, as
+    it would as a dict key.
+    """
+    last = {alias: i for i, (alias, _) in enumerate(projection)}
+    values = [eval_rows(projection[i][1], rows) for i in last.values()]
+    return list(last), [list(row_values) for row_values in zip(*values)]
+
+def _unique_columns(schema, rows):
+    # Collapse repeated column names the way a dict row would
+    last = {col: i for i, col in enumerate(schema)}
+    if len(last) == len(schema):
+        return schema, rows
+    positions = list(last.values())
+    return list(last), [[row[i] for i in positions] for row in rows]
+
+class _Descending:
+    """Sort key wrapper that inverts the ordering of the wrapped value."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+def _sort_getter(col, schema=None):
+    # Rows are dicts unless a schema is given, in which case they are value
+    # lists; an unknown column sorts as NULL either way
+    if schema is None:
+        return lambda r: r.get(col)
+    if col in schema:
+        return operator.itemgetter(schema.index(col))
+    return lambda r: None
+
+def _sort_key(order_cols, schema=None):
+    getters = [_sort_getter(col, schema) for col, _ in order_cols]
+    if len(getters) == 1:
+        return getters[0]
+    if len({asc for _, asc in order_cols}) == 1:
+        return lambda r: tuple([get(r) for get in getters])
+    pairs = [(get, asc) for get, (_, asc) in zip(getters, order_cols)]
+    return lambda r: tuple([get(r) if asc else _Descending(get(r)) for get, asc in pairs])
+
+def order_by(rows, order_cols, schema=None):
+    # One stable sort on a composite key; descending columns are wrapped
+    # only when the directions are mixed
+    directions = {asc for _, asc in order_cols}
+    rows.sort(key=_sort_key(order_cols, schema), reverse=directions == {False})
     return rows
 
 def limit_offset(rows, limit=None, offset=None):
@@ -123,11 +363,113 @@ def limit_offset(rows, limit=None, offset=None):
         rows = rows[:limit]
     return rows
 
-def execute_select(ir):
+def order_limit(rows, order_cols, limit=None, offset=None, schema=None):
+    """
+    Apply ORDER BY, then OFFSET and LIMIT.
+
+    With a LIMIT and a single sort direction only the first offset + limit
+    rows are needed, so they are selected with a bounded heap in
+    O(n log k) instead of sorting every row. Rows are dicts, or value lists
+    when their schema is given.
+    """
+    if order_cols and limit and len({asc for _, asc in order_cols}) == 1:
+        select = heapq.nsmallest if order_cols[0][1] else heapq.nlargest
+        rows = select(limit + (offset or 0), rows, key=_sort_key(order_cols, schema))
+    elif order_cols:
+        rows = order_by(rows, order_cols, schema)
+    return limit_offset(rows, limit, offset)
+
+def from_clause_schema(from_clause):
+    if isinstance(from_clause, str):
+        return fetch_table_rows(from_clause)[0]
+    left_table = from_clause["left"]
+    right_table = from_clause["right"]
+    return ([f"{left_table}.{col}" for col in fetch_table_rows(left_table)[0]] +
+            [f"{right_table}.{col}" for col in fetch_table_rows(right_table)[0]])
+
+def get_index(table_name, column):
+    """
+    Return the hash index {value: [rows]} on a table column.
+
+    Indexes are built on first use and kept alongside the table's rows;
+    inserts extend them, while updates and deletes drop the ones they
+    invalidate. Raises TypeError if the column holds unhashable values.
+    """
+    table = tables[table_name]
+    indexes = table.setdefault("indexes", {})
+    index = indexes.get(column)
+    if index is None:
+        pos = column_positions(table_name)[column]
+        index = defaultdict(list)
+        for row in table["rows"]:
+            index[row[pos]].append(row)
+        index = indexes[column] = dict(index)
+    return index
+
+def _point_lookup(where, schema):
+    """Return (column, value) if where is an equality between a column and a literal."""
+    if isinstance(where, dict):
+        if where.get("type") != "comparison" or where["op"] != "=":
+            return None
+        for col, value in ((where["left"], where["right"]), (where["right"], where["left"])):
+            if (isinstance(col, str) and col in schema and not isinstance(value, dict)
+                    and not (isinstance(value, str) and value in schema)):
+                return col, value
+        return None
+    if not isinstance(where, str):
+        return None
+    # Read the expression the way compile_row_expr does, so the index
+    # matches exactly the rows a scan would
+    columns = {col.replace('.', '_'): col for col in schema}
+    try:
+        node = ast.parse(where.replace('.', '_'), mode="eval").body
+    except SyntaxError:
+        return None
+    if not (isinstance(node, ast.Compare) and len(node.ops) == 1
+            and isinstance(node.ops[0], ast.Eq)):
+        return None
+    for col_node, literal_node in ((node.left, node.comparators[0]),
+                                   (node.comparators[0], node.left)):
+        if isinstance(col_node, ast.Name) and col_node.id in columns:
+            is_literal, value = _literal(literal_node)
+            if is_literal:
+                return columns[col_node.id], value
+    return None
+
+def prepare_select(ir):
+    schema = from_clause_schema(ir["from"])
+    where = compile_condition(ir.get("where"), schema)
+    lookup = _point_lookup(ir.get("where"), schema) if isinstance(ir["from"], str) else None
+
+    projection = None
+    if not ir.get("group_by"):
+        projection = [(col.get("alias") or col["expr"], compile_row_expr(col["expr"], schema))
+                      for col in ir["columns"]]
+    return PreparedPlan(ir, schema, where, lookup, projection, _schema_version)
+
+def get_prepared_select(ir):
+    key = repr(ir)
+    plan = _plan_cache.get(key)
+    if plan is not None and plan.schema_version == _schema_version:
+        _plan_cache.move_to_end(key)
+        return plan
+    plan = _plan_cache[key] = prepare_select(ir)
+    if len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+    return plan
+
+def execute_prepared(plan):
+    ir = plan.ir
     from_clause = ir["from"]
+    filtered = None
     if isinstance(from_clause, str):
         schema, rows = fetch_table_rows(from_clause)
-        row_dicts = [dict(zip(schema, row)) for row in rows]
+        if plan.lookup is not None:
+            column, value = plan.lookup
+            try:
+                filtered = get_index(from_clause, column).get(value, [])
+            except TypeError:
+                pass  # unhashable values; fall back to a scan
     else:
         left_table = from_clause["left"]
         right_table = from_clause["right"]
@@ -137,37 +479,28 @@ def execute_select(ir):
         left_schema, left_rows = fetch_table_rows(left_table)
         right_schema, right_rows = fetch_table_rows(right_table)
 
-        schema, row_dicts = join_tables(left_table, left_schema, left_rows,
-                                        right_table, right_schema, right_rows,
-                                        join_keys, join_type)
+        schema, rows = join_tables(left_table, left_schema, left_rows,
+                                   right_table, right_schema, right_rows,
+                                   join_keys, join_type)
 
-    filtered = [row for row in row_dicts if evaluate_condition(ir.get("where"), row)]
+    if filtered is None:
+        if plan.where is None:
+            filtered = rows
+        else:
+            filtered = list(compress(rows, eval_rows(plan.where, rows)))
 
     group_by_cols = ir.get("group_by")
     agg_columns = [c for c in ir["columns"] if "agg" in c]
 
     if group_by_cols:
-        schema, rows = group_by(
-            [[row[col] for col in schema] for row in filtered],
-            schema, group_by_cols, agg_columns
-        )
-        results = [dict(zip(schema, row)) for row in rows]
+        schema, rows = _unique_columns(*group_by(filtered, schema, group_by_cols, agg_columns))
     else:
-        results = evaluate_columns(
-            [[row[col] for col in schema] for row in filtered], schema, ir["columns"]
-        )
-
-    if "order_by" in ir:
-        results = order_by(results, ir["order_by"])
-
-    results = limit_offset(results, ir.get("limit"), ir.get("offset"))
+        schema, rows = project_columns(filtered, plan.projection)
 
-    if results and isinstance(results[0], dict):
-        schema = list(results[0].keys())
-        rows = [list(row.values()) for row in results]
-    else:
+    # Rows stay value lists through ORDER BY and LIMIT; no dict is built
+    rows = order_limit(rows, ir.get("order_by"), ir.get("limit"), ir.get("offset"), schema)
+    if not rows:
         schema = []
-        rows = results
 
     return schema, rows
 
@@ -180,16 +513,23 @@ def execute_insert(ir):
         raise ValueError(f"Table '{table_name}' not found.")
 
     schema = tables[table_name]["columns"]
+    col_idx = column_positions(table_name)
     new_row = [None] * len(schema) if columns else values
 
     if columns:
-        col_idx = {col: i for i, col in enumerate(schema)}
         for col, val in zip(columns, values):
             if col not in col_idx:
                 raise ValueError(f"Column '{col}' not found.")
             new_row[col_idx[col]] = val
 
     tables[table_name]["rows"].append(new_row)
+
+    indexes = tables[table_name].get("indexes", {})
+    for col, index in list(indexes.items()):
+        try:
+            index.setdefault(new_row[col_idx[col]], []).append(new_row)
+        except TypeError:
+            del indexes[col]
     return {"status": "OK", "inserted": new_row}
 
 def execute_update(ir):
@@ -202,19 +542,28 @@ def execute_update(ir):
 
     schema = tables[table_name]["columns"]
     rows = tables[table_name]["rows"]
-    col_idx = {col: i for i, col in enumerate(schema)}
+    col_idx = column_positions(table_name)
+
+    where = compile_condition(where_expr, schema)
+    matched = rows if where is None else list(compress(rows, eval_rows(where, rows)))
+    if matched:
+        for col in set_exprs:
+            if col not in col_idx:
+                raise ValueError(f"Column '{col}' not found.")
 
-    updated_count = 0
-    for row in rows:
-        row_dict = dict(zip(schema, row))
-        if evaluate_condition(where_expr, row_dict):
-            for col, expr in set_exprs.items():
-                if col not in col_idx:
-                    raise ValueError(f"Column '{col}' not found.")
-                row[col_idx[col]] = safe_eval(expr, row_dict)
-            updated_count += 1
+        # Every SET expression sees the row as it was before the update
+        new_values = [(col_idx[col], eval_rows(compile_row_expr(expr, schema), matched))
+                      for col, expr in set_exprs.items()]
+        for i, row in enumerate(matched):
+            for pos, values in new_values:
+                row[pos] = values[i]
 
-    return {"status": "OK", "updated": updated_count}
+        # Rows are updated in place, so only indexes on SET columns go stale
+        indexes = tables[table_name].get("indexes", {})
+        for col in set_exprs:
+            indexes.pop(col, None)
+
+    return {"status": "OK", "updated": len(matched)}
 
 def execute_delete(ir):
     table_name = ir["table"]
@@ -226,27 +575,36 @@ def execute_delete(ir):
     schema = tables[table_name]["columns"]
     rows = tables[table_name]["rows"]
 
-    new_rows = []
-    deleted_count = 0
-    for row in rows:
-        row_dict = dict(zip(schema, row))
-        if not evaluate_condition(where_expr, row_dict):
-            new_rows.append(row)
-        else:
-            deleted_count += 1
+    where = compile_condition(where_expr, schema)
+    if where is None:
+        new_rows = []
+    else:
+        new_rows = [row for row, hit in zip(rows, eval_rows(where, rows)) if not hit]
+    deleted_count = len(rows) - len(new_rows)
 
     tables[table_name]["rows"] = new_rows
+    if deleted_count:
+        tables[table_name].pop("indexes", None)
     return {"status": "OK", "deleted": deleted_count}
 
 def execute_create_table(ir):
+    global _schema_version
+    _schema_version += 1
     table_name = ir["name"]
     columns = ir["columns"]
     if table_name in tables:
         raise ValueError(f"Table '{table_name}' already exists.")
-    tables[table_name] = {"columns": columns, "rows": []}
+    tables[table_name] = {
+        "columns": columns,
+        "rows": [],
+        "indexes": {},
+        "col_idx": {col: i for i, col in enumerate(columns)}
+    }
     return {"status": "OK", "created": table_name}
 
 def execute_drop_table(ir):
+    global _schema_version
+    _schema_version += 1
     table_name = ir["name"]
     if table_name in tables:
         del tables[table_name]
@@ -254,6 +612,8 @@ def execute_drop_table(ir):
     raise ValueError(f"Table '{table_name}' not found.")
 
 def execute_rename_table(ir):
+    global _schema_version
+    _schema_version += 1
     old_name = ir["old_name"]
     new_name = ir["new_name"]
     if old_name not in tables:
@@ -270,9 +630,8 @@ def execute_rename_table(ir):
 #     return {"status": "OK", "view": view_name}
 
 def execute_show_table(ir):
-    tables_list = sorted(tables.keys())
     schema = ["table_name"]
-    rows = [[t] for t in tables_list]
+    rows = [[t] for t in list_tables()]
     return schema, rows
 
 def execute_describe_table(ir):
@@ -297,29 +656,27 @@ def execute_transaction(ir):
     return {"status": "OK", "transaction": action}
 
 
+def execute_cached_select(ir):
+    return execute_prepared(get_prepared_select(ir))
+
+# Handler for each IR query type
+_DISPATCH = {
+    "select": execute_cached_select,
+    "insert": execute_insert,
+    "update": execute_update,
+    "delete": execute_delete,
+    "create_table": execute_create_table,
+    "drop_table": execute_drop_table,
+    "rename_table": execute_rename_table,
+    # "create_view": execute_create_view,
+    "show_table": execute_show_table,
+    "describe_table": execute_describe_table,
+    "transaction": execute_transaction,
+}
+
 def execute_query(ir):
     qtype = ir["type"]
-    if qtype == "select":
-        return execute_select(ir)
-    elif qtype == "insert":
-        return execute_insert(ir)
-    elif qtype == "update":
-        return execute_update(ir)
-    elif qtype == "delete":
-        return execute_delete(ir)
-    elif qtype == "create_table":
-        return execute_create_table(ir)
-    elif qtype == "drop_table":
-        return execute_drop_table(ir)
-    elif qtype == "rename_table":
-        return execute_rename_table(ir)
-    # elif qtype == "create_view":
-    #     return execute_create_view(ir)
-    elif qtype == "show_table":
-        return execute_show_table(ir)
-    elif qtype == "describe_table":
-        return execute_describe_table(ir)
-    elif qtype == "transaction":
-        return execute_transaction(ir)
-    else:
-        raise NotImplementedError(f"Query type '{qtype}' not supported.")
\ No newline at end of file
+    handler = _DISPATCH.get(qtype)
+    if handler is None:
+        raise NotImplementedError(f"Query type '{qtype}' not supported.")
+    return handler(ir)
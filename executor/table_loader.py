@@ -1,17 +1,97 @@
 import json
 import os
+from collections.abc import ItemsView, KeysView, ValuesView
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib parser
+    orjson = None
 
 # Directory containing individual JSON files like student.json, lecturer.json, etc.
 DATA_FOLDER = "data"
 
-# This will hold all the table data
-tables = {}
 
-# Load all .json files from the data folder
-for filename in os.listdir(DATA_FOLDER):
-    if filename.endswith(".json"):
-        table_name = filename[:-5]  # Remove '.json'
-        file_path = os.path.join(DATA_FOLDER, filename)
-        with open(file_path, "r") as f:
-            tables[table_name] = json.load(f)
+class _LazyTables(dict):
+    """
+    Table registry that reads each table's JSON file on first access.
+
+    The data folder is listed once; file contents are only loaded when a
+    table is actually used, so startup cost no longer grows with the number
+    of tables on disk. Membership tests, iteration and deletion see tables
+    that have not been loaded yet.
+
+    keys(), values() and items() return views over every table, loaded or
+    not. keys() reads no files, but iterating values() or items() loads
+    each table that is not in memory yet, so callers that only need names
+    should use keys() or list_tables().
+    """
+
+    def __init__(self, folder):
+        super().__init__()
+        self._folder = folder
+        self._unloaded = set()
+        if os.path.isdir(folder):
+            for filename in os.listdir(folder):
+                if filename.endswith(".json"):
+                    self._unloaded.add(filename[:-5])  # Remove '.json'
+
+    def __missing__(self, table_name):
+        if table_name not in self._unloaded:
+            raise KeyError(table_name)
+        file_path = os.path.join(self._folder, f"{table_name}.json")
+        with open(file_path, "rb") as f:
+            data = f.read()
+        table = orjson.loads(data) if orjson is not None else json.loads(data)
+        self._unloaded.discard(table_name)
+        super().__setitem__(table_name, table)
+        return table
+
+    def __contains__(self, table_name):
+        return super().__contains__(table_name) or table_name in self._unloaded
+
+    def __setitem__(self, table_name, table):
+        self._unloaded.discard(table_name)
+        super().__setitem__(table_name, table)
+
+    def __delitem__(self, table_name):
+        if table_name in self._unloaded:
+            self._unloaded.discard(table_name)
+        else:
+            super().__delitem__(table_name)
+
+    def get(self, table_name, default=None):
+        return self[table_name] if table_name in self else default
+
+    def pop(self, table_name, *default):
+        if table_name in self:
+            table = self[table_name]
+            del self[table_name]
+            return table
+        if default:
+            return default[0]
+        raise KeyError(table_name)
+
+    def __iter__(self):
+        yield from list(super().keys())
+        yield from sorted(self._unloaded)
+
+    def __len__(self):
+        return super().__len__() + len(self._unloaded)
+
+    def keys(self):
+        return KeysView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+
+def list_tables():
+    """Return the names of all known tables without loading their data."""
+    return sorted(tables)
+
 
+# This will hold all the table data, loaded per table on first use
+tables = _LazyTables(DATA_FOLDER)
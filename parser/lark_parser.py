@@ -1,11 +1,12 @@
-from lark import Lark, Transformer, v_args
+from lark import Lark, Token, Transformer, v_args
 
 sql_grammar = r"""
 start: stmt (";" stmt)* ";"?
 
 stmt: select_stmt | insert_stmt | create_table_stmt | create_function_stmt
 
-select_stmt: "SELECT" column_list "FROM" NAME where_clause?
+select_stmt: "SELECT" DISTINCT? column_list "FROM" NAME where_clause?
+DISTINCT: "DISTINCT"
 where_clause: "WHERE" condition
 condition: function_call | comparison
 comparison: expr OPERATOR expr
@@ -55,6 +56,9 @@ class SQLTransformer(Transformer):
         return stmt
 
     def select_stmt(self, *args):
+        distinct = isinstance(args[0], Token) and args[0].type == "DISTINCT"
+        if distinct:
+            args = args[1:]
         cols = args[0]
         table = args[1]
         where = args[2] if len(args) > 2 else None
@@ -62,7 +66,8 @@ class SQLTransformer(Transformer):
             "type": "select",
             "columns": cols,
             "from": str(table),
-            "where": where
+            "where": where,
+            "distinct": distinct
         }
 
     def where_clause(self, condition):
@@ -217,7 +222,13 @@ class SQLTransformer(Transformer):
             return v
         return v
 
-parser = Lark(sql_grammar, parser='lalr', transformer=SQLTransformer())
+# The transformer is stateless, so a single instance is shared by every parse.
+transformer = SQLTransformer()
+
+# cache=True pickles the analysed LALR tables to the temp directory under a
+# file name derived from a hash of the grammar, options and Lark version, so
+# later runs skip grammar analysis and grammar edits invalidate the cache.
+parser = Lark(sql_grammar, parser='lalr', transformer=transformer, cache=True)
 
 # sql1 = "SELECT name, age FROM users WHERE age >= 25 AND name != 'Alice'"
 # sql2 = "INSERT INTO users (name, age) VALUES ('Bob', 30)"
@@ -0,0 +1,317 @@
+"""
+Handwritten recursive-descent parser for the SQL subset in lark_parser.
+
+It produces exactly what the Lark parser and SQLTransformer produce, NAME
+tokens included, without building a parse tree or dispatching a transformer
+callback per production. Tokens are matched on demand against only the
+terminals the current production accepts, like Lark's contextual lexer.
+Anything it does not accept is handed to the Lark parser, which either
+parses it or raises its usual error, so error messages are unchanged.
+"""
+import re
+
+from lark import Token
+
+_WS = re.compile(r"[ \t\f\r\n]*")
+_NAME = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+_STRING = re.compile(r"'[^']*'|\"[^\"]*\"")
+_SIGNED_NUMBER = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+_OPERATOR = re.compile(r">=|<=|!=|>|<|=")
+_ARITH_OP = re.compile(r"[-+*/]")
+_TYPE = re.compile(r"INT|TEXT|FLOAT|BOOL")
+
+
+class _NoMatch(Exception):
+    """Raised when the input leaves the subset this parser handles."""
+
+
+class _Cursor:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def _match(self, pattern):
+        self.pos = _WS.match(self.text, self.pos).end()
+        m = pattern.match(self.text, self.pos)
+        if m is None:
+            return None
+        self.pos = m.end()
+        return m.group()
+
+    def peek(self, literal):
+        pos = _WS.match(self.text, self.pos).end()
+        return self.text.startswith(literal, pos)
+
+    def peek_pattern(self, pattern):
+        pos = _WS.match(self.text, self.pos).end()
+        return pattern.match(self.text, pos) is not None
+
+    def accept(self, literal):
+        self.pos = _WS.match(self.text, self.pos).end()
+        if self.text.startswith(literal, self.pos):
+            self.pos += len(literal)
+            return True
+        return False
+
+    def accept_word(self, word):
+        # Like Lark's lexer, a keyword only matches a whole NAME, so
+        # "DISTINCTx" stays a column name
+        pos = _WS.match(self.text, self.pos).end()
+        m = _NAME.match(self.text, pos)
+        if m is None or m.group() != word:
+            return False
+        self.pos = m.end()
+        return True
+
+    def expect(self, literal):
+        if not self.accept(literal):
+            raise _NoMatch(literal)
+
+    def expect_pattern(self, pattern):
+        value = self._match(pattern)
+        if value is None:
+            raise _NoMatch(pattern.pattern)
+        return value
+
+    def try_pattern(self, pattern):
+        return self._match(pattern)
+
+    def at_end(self):
+        return _WS.match(self.text, self.pos).end() == len(self.text)
+
+
+def _convert_value(token):
+    # Mirrors SQLTransformer.value for terminal tokens
+    if token.startswith("'") or token.startswith('"'):
+        return token[1:-1]
+    if token.lower() in ('true', 'false'):
+        return token.lower()
+    try:
+        if '.' in token:
+            return float(token)
+        return int(token)
+    except ValueError:
+        return token
+
+
+class SQLParser:
+    """
+    Recursive-descent SQL parser with the Lark parser as fallback.
+
+    Attributes:
+        legacy: If True, every statement goes straight to the Lark parser.
+    """
+
+    def __init__(self, legacy=False):
+        self.legacy = legacy
+        self._lark = None
+
+    def _fallback(self):
+        if self._lark is None:
+            from parser.lark_parser import parser as lark_parser
+            self._lark = lark_parser
+        return self._lark
+
+    def parse(self, text):
+        if not self.legacy:
+            try:
+                return self._parse_start(_Cursor(text))
+            except _NoMatch:
+                pass
+        return self._fallback().parse(text)
+
+    def _parse_start(self, cur):
+        statements = [self._parse_stmt(cur)]
+        while cur.accept(";"):
+            if cur.at_end():
+                break
+            statements.append(self._parse_stmt(cur))
+        if not cur.at_end():
+            raise _NoMatch("end of input")
+        return statements
+
+    def _parse_stmt(self, cur):
+        if cur.accept("SELECT"):
+            return self._parse_select(cur)
+        if cur.accept("INSERT"):
+            return self._parse_insert(cur)
+        if cur.accept("CREATE"):
+            if cur.accept("TABLE"):
+                return self._parse_create_table(cur)
+            if cur.accept("FUNCTION"):
+                return self._parse_create_function(cur)
+        raise _NoMatch("statement")
+
+    def _parse_select(self, cur):
+        distinct = cur.accept_word("DISTINCT")
+        columns = self._parse_column_list(cur)
+        cur.expect("FROM")
+        table = cur.expect_pattern(_NAME)
+        where = None
+        if cur.accept("WHERE"):
+            where = self._parse_condition(cur)
+        return {
+            "type": "select",
+            "columns": columns,
+            "from": table,
+            "where": where,
+            "distinct": distinct
+        }
+
+    def _parse_insert(self, cur):
+        cur.expect("INTO")
+        table = cur.expect_pattern(_NAME)
+        cur.expect("(")
+        columns = self._parse_column_list(cur)
+        cur.expect(")")
+        cur.expect("VALUES")
+        cur.expect("(")
+        values = self._parse_value_list(cur)
+        cur.expect(")")
+        return {
+            "type": "insert",
+            "table": table,
+            "columns": columns,
+            "values": values
+        }
+
+    def _parse_create_table(self, cur):
+        table = cur.expect_pattern(_NAME)
+        cur.expect("(")
+        columns = []
+        while True:
+            name = cur.expect_pattern(_NAME)
+            columns.append({"name": name, "datatype": cur.expect_pattern(_TYPE)})
+            if not cur.accept(","):
+                break
+        cur.expect(")")
+        return {
+            "type": "create_table",
+            "table": table,
+            "columns": columns
+        }
+
+    def _parse_create_function(self, cur):
+        name = cur.expect_pattern(_NAME)
+        cur.expect("(")
+        params = []
+        while True:
+            param = cur.expect_pattern(_NAME)
+            params.append({"name": param, "type": cur.expect_pattern(_TYPE)})
+            if not cur.accept(","):
+                break
+        cur.expect(")")
+        cur.expect("RETURNS")
+        return_type = cur.expect_pattern(_TYPE)
+        cur.expect("BEGIN")
+        if cur.accept("IF"):
+            body = self._parse_if(cur)
+        else:
+            body = self._parse_return(cur)
+        cur.expect("END")
+        cur.expect(";")
+        return {
+            "type": "create_function",
+            "name": name,
+            "params": params,
+            "return_type": return_type,
+            "body": body
+        }
+
+    def _parse_if(self, cur):
+        condition = self._parse_comparison(cur, self._parse_expr(cur))
+        cur.expect("THEN")
+        then_stmt = self._parse_return(cur)
+        cur.expect("ELSE")
+        else_stmt = self._parse_return(cur)
+        cur.expect("END")
+        cur.expect("IF")
+        cur.expect(";")
+        return {
+            "type": "if_stmt",
+            "condition": condition,
+            "then": then_stmt,
+            "else": else_stmt
+        }
+
+    def _parse_return(self, cur):
+        cur.expect("RETURN")
+        value = self._parse_expr(cur)
+        cur.expect(";")
+        return {
+            "type": "return_stmt",
+            "value": value
+        }
+
+    def _parse_condition(self, cur):
+        left = self._parse_expr(cur)
+        if (isinstance(left, dict) and left["type"] == "function_call"
+                and not cur.peek_pattern(_OPERATOR)):
+            return left
+        return self._parse_comparison(cur, left)
+
+    def _parse_comparison(self, cur, left):
+        op = cur.expect_pattern(_OPERATOR)
+        return {
+            "type": "comparison",
+            "left": left,
+            "op": op,
+            "right": self._parse_expr(cur)
+        }
+
+    def _parse_column_list(self, cur):
+        columns = []
+        while True:
+            name = cur.expect_pattern(_NAME)
+            if cur.peek("("):
+                columns.append(self._parse_function_call(cur, name))
+            else:
+                columns.append(Token("NAME", name))
+            if not cur.accept(","):
+                return columns
+
+    def _parse_value_list(self, cur):
+        values = [self._parse_value(cur)]
+        while cur.accept(","):
+            values.append(self._parse_value(cur))
+        return values
+
+    def _parse_function_call(self, cur, name):
+        cur.expect("(")
+        arguments = []
+        if not cur.accept(")"):
+            arguments = self._parse_value_list(cur)
+            cur.expect(")")
+        return {
+            "type": "function_call",
+            "function_name": name,
+            "arguments": arguments
+        }
+
+    def _parse_expr(self, cur):
+        left = self._parse_value(cur)
+        op = cur.try_pattern(_ARITH_OP)
+        if op is None:
+            return left
+        return {
+            "type": "arithmetic",
+            "left": left,
+            "op": op,
+            "right": self._parse_value(cur)
+        }
+
+    def _parse_value(self, cur):
+        string = cur.try_pattern(_STRING)
+        if string is not None:
+            return string[1:-1]
+        number = cur.try_pattern(_SIGNED_NUMBER)
+        if number is not None:
+            return _convert_value(Token("SIGNED_NUMBER", number))
+        name = cur.expect_pattern(_NAME)
+        if cur.peek("("):
+            return self._parse_function_call(cur, name)
+        return _convert_value(Token("NAME", name))
+
+
+# Shared by the REPL and the file runner.
+parser = SQLParser()
@@ -1,7 +1,11 @@
-from typing import List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from core.json_table import JSONTable
 from core.base_table import BaseTable
+import logging
 import operator
+import os
+
+_LOG = logging.getLogger(__name__)
 
 ops = {
     "=": operator.eq,
@@ -14,6 +18,83 @@ ops = {
     "not in": lambda x, y: x not in y
 }
 
+# Python source for each operator, used to fuse criteria into one predicate
+_OP_SOURCE = {
+    "=": "==",
+    "!=": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "in": "in",
+    "not in": "not in"
+}
+
+
+def _compile_criteria(criteria: List[dict], columns: List[str]) -> Optional[Callable[[List[Any]], bool]]:
+    """
+    Fuse select criteria into a single predicate over a stored row list.
+
+    Criteria whose operator or column is unknown are skipped, as before.
+    Column positions and comparison values are bound once, so testing a row
+    costs one call instead of a generator and several dict lookups per
+    condition.
+
+    Returns:
+        The predicate, or None if no criterion applies.
+    """
+    col_idx = {col: i for i, col in enumerate(columns)}
+    terms = []
+    namespace = {}
+    for i, condition in enumerate(criteria):
+        op, column = condition["operator"], condition["column"]
+        if op not in ops or column not in col_idx:
+            continue
+        namespace[f"_v{i}"] = condition["value"]
+        if op in _OP_SOURCE:
+            terms.append(f"row[{col_idx[column]}] {_OP_SOURCE[op]} _v{i}")
+        else:
+            namespace[f"_op{i}"] = ops[op]
+            terms.append(f"_op{i}(row[{col_idx[column]}], _v{i})")
+    if not terms:
+        return None
+    return eval(f"lambda row: {' and '.join(terms)}", namespace)
+
+
+# Tables read from disk, shared by all Executors, keyed by name and stored
+# with the (mtime, size) of the file they match
+_table_cache: Dict[str, Tuple[Tuple[int, int], JSONTable]] = {}
+
+
+def _file_stamp(table_name: str, base_path: str = "data") -> Tuple[int, int]:
+    stat = os.stat(os.path.join(base_path, f"{table_name}.json"))
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _remember(table: JSONTable) -> None:
+    """Record a table that was just written so later loads reuse it."""
+    _table_cache[table.name] = (_file_stamp(table.name), table)
+
+
+def _cached_load(table_name: str) -> JSONTable:
+    """
+    Load a table, reusing the cached copy while its file is unchanged.
+
+    Raises:
+        FileNotFoundError: If the table's file doesn't exist.
+    """
+    try:
+        stamp = _file_stamp(table_name)
+    except FileNotFoundError:
+        return JSONTable.load(table_name)
+    cached = _table_cache.get(table_name)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    table = JSONTable.load(table_name)
+    _table_cache[table_name] = (stamp, table)
+    return table
+
+
 class Executor:
     def __init__(self, table_name: str, storage_type: str = "json"):
         """
@@ -25,6 +106,12 @@ class Executor:
         """
         self.storage_type = storage_type
         self.table_name = table_name
+        self.storage: Optional[JSONTable] = None
+
+    def _table(self) -> JSONTable:
+        """Return the table, re-reading it only if its file changed on disk."""
+        self.storage = _cached_load(self.table_name)
+        return self.storage
 
     def create_table(self, columns: List[str]) -> None:
         """
@@ -33,74 +120,74 @@ class Executor:
         Args:
             columns: List of column names for the new table.
         """
-        if self.storage_type == "json":
-            self.storage = JSONTable(self.table_name, columns)
-        else:
+        if self.storage_type != "json":
             raise ValueError(f"Unsupported storage type: {self.storage_type}")
-        
-        if not self.storage.exists(self.table_name):
-            self.storage.save()
-        
+
+        if JSONTable.exists(self.table_name):
+            self.storage = None
+            return
+        self.storage = JSONTable(self.table_name, columns)
+        self.storage.save()
+        _remember(self.storage)
+
 
     def insert(self, values: List[Any]) -> None:
         """
-        Insert a new row into the table.
+        Insert a new row into the table and write the table to disk.
+
+        The loaded table is kept, so the next insert or select does not
+        read the file again unless something else changed it.
 
         Args:
             values: List of values to insert into the table.
         """
-        self.storage = JSONTable.load(self.table_name)
         if self.storage_type != "json":
             raise ValueError(f"Unsupported storage type: {self.storage_type}")
-        if not self.storage.exists(self.table_name):
-            raise ValueError(f"Table '{self.table_name}' does not exist.")
-        print("Inserting values into table:", values)
-        table = JSONTable(self.table_name, self.storage.columns)
+        table = self._table()
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Inserting values into table: %s", values)
         table.insert(values)
-        table.save()
-        # self.storage.insert(values)
+        try:
+            table.save()
+        except Exception:
+            # The cached copy is shared, so it must not hold unwritten rows
+            table.rows.pop()
+            raise
+        _remember(table)
 
     def select(self, criteria: Optional[List[dict]] = None, columns: Optional[List[str]] = None) -> Optional[List[dict]]:
         """
         Select rows from the table based on the given criteria and selected columns.
         """
-        print("columns: ", columns)
-        print("criteria: ", criteria)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("columns: %s", columns)
+            _LOG.debug("criteria: %s", criteria)
         if criteria is None:
             criteria = []
         if columns is None:
             columns = ['all']
 
-        self.storage = JSONTable.load(self.table_name)
-
         if self.storage_type != "json":
             raise ValueError(f"Unsupported storage type: {self.storage_type}")
-        if not self.storage.exists(self.table_name):
-            raise ValueError(f"Table '{self.table_name}' does not exist.")
-        
-        print("Selecting rows with criteria:", criteria)
-        all_rows = self.storage.select_all()
-
-        # Apply filtering
-        if criteria:
-            filtered_rows = [
-                row for row in all_rows
-                if all(
-                    ops[condition["operator"]](row[condition["column"]], condition["value"])
-                    for condition in criteria
-                    if condition["operator"] in ops and condition["column"] in row
-                )
-            ]
-        else:
-            filtered_rows = all_rows
+        self._table()
+
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Selecting rows with criteria: %s", criteria)
+        table_columns = self.storage.columns
 
-        print("Filtering rows by columns:", columns)
+        # Apply filtering on the stored rows; dicts are only built for matches
+        predicate = _compile_criteria(criteria, table_columns)
+        rows = self.storage.rows if predicate is None else list(filter(predicate, self.storage.rows))
+
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Filtering rows by columns: %s", columns)
 
         # Apply column selection
         if columns != ['all']:
-            filtered_rows = [
-                {col: row[col] for col in columns if col in row}
-                for row in filtered_rows
-            ]
+            col_idx = {col: i for i, col in enumerate(table_columns)}
+            selected = [(col, col_idx[col]) for col in columns if col in col_idx]
+            filtered_rows = [{col: row[pos] for col, pos in selected} for row in rows]
+        else:
+            filtered_rows = [dict(zip(table_columns, row)) for row in rows]
 
         return filtered_rows if filtered_rows else None
@@ -0,0 +1,232 @@
+import os
+import sys
+import unittest
+
+# The engine imports its table registry as a top-level module
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "executor"))
+
+import execution_engine as engine  # noqa: E402
+from execution_engine import execute_query, tables  # noqa: E402
+
+
+def _create(name, columns, rows):
+    execute_query({"type": "create_table", "name": name, "columns": columns})
+    for row in rows:
+        execute_query({"type": "insert", "into": name, "values": list(row)})
+
+
+class EngineTestCase(unittest.TestCase):
+    TABLES = ("eng_items", "eng_stock", "eng_old")
+
+    def setUp(self):
+        self.addCleanup(self._drop_tables)
+        _create("eng_items", ["id", "label", "qty"], [
+            (1, "apple", 10), (2, "pear", 3), (3, "plum", 30), (4, "pear", 7)
+        ])
+
+    def _drop_tables(self):
+        for name in self.TABLES:
+            if name in tables:
+                del tables[name]
+
+    def _select(self, columns, where=None, **clauses):
+        ir = {"type": "select", "from": "eng_items", "where": where,
+              "columns": [{"expr": col} for col in columns]}
+        ir.update(clauses)
+        return execute_query(ir)
+
+
+class TestSelect(EngineTestCase):
+    def test_where_and_projection(self):
+        ir = {
+            "type": "select", "from": "eng_items", "where": "qty > 5",
+            "columns": [{"expr": "label"}, {"expr": "qty * 2", "alias": "double"}, {"expr": "id + qty"}]
+        }
+        self.assertEqual(execute_query(ir), (
+            ["label", "double", "id + qty"],
+            [["apple", 20, 11], ["plum", 60, 33], ["pear", 14, 11]]
+        ))
+
+    def test_structured_comparison(self):
+        where = {"type": "comparison", "left": {"type": "arithmetic", "left": "qty", "op": "*", "right": 2},
+                 "op": "<=", "right": 14}
+        self.assertEqual(self._select(["id"], where), (["id"], [[2], [4]]))
+
+    def test_no_matches(self):
+        self.assertEqual(self._select(["id"], "qty > 100"), ([], []))
+
+
+class TestPointLookup(EngineTestCase):
+    def _ids(self, where):
+        return [row[0] for row in self._select(["id", "qty"], where)[1]]
+
+    def test_equality_uses_index(self):
+        self.assertEqual(self._ids("label == 'pear'"), [2, 4])
+        self.assertIn("label", tables["eng_items"]["indexes"])
+        self.assertEqual(self._ids({"type": "comparison", "left": "pear", "op": "=", "right": "label"}), [2, 4])
+        self.assertEqual(self._ids("label == 'fig'"), [])
+
+    def test_index_follows_insert(self):
+        self.assertEqual(self._ids("label == 'pear'"), [2, 4])
+        execute_query({"type": "insert", "into": "eng_items", "columns": ["label", "id"], "values": ["pear", 5]})
+        self.assertEqual(self._select(["id", "qty"], "label == 'pear'")[1], [[2, 3], [4, 7], [5, None]])
+
+    def test_index_follows_update(self):
+        self.assertEqual(self._ids("label == 'pear'"), [2, 4])
+        self.assertEqual(self._ids("qty == 3"), [2])
+        result = execute_query({"type": "update", "table": "eng_items", "set": {"label": "'fig'", "qty": "qty + 1"},
+                                "where": "id == 2"})
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(self._ids("label == 'pear'"), [4])
+        self.assertEqual(self._ids("label == 'fig'"), [2])
+        self.assertEqual(self._ids("qty == 3"), [])
+        self.assertEqual(self._ids("qty == 4"), [2])
+
+        # Rows are updated in place, so an index on another column still finds them
+        self.assertEqual(self._ids("id == 3"), [3])
+        execute_query({"type": "update", "table": "eng_items", "set": {"qty": "0"}, "where": "label == 'plum'"})
+        self.assertEqual(self._select(["qty"], "id == 3")[1], [[0]])
+
+    def test_index_follows_delete(self):
+        self.assertEqual(self._ids("label == 'pear'"), [2, 4])
+        result = execute_query({"type": "delete", "table": "eng_items", "where": "label == 'pear'"})
+        self.assertEqual(result["deleted"], 2)
+        self.assertEqual(self._ids("label == 'pear'"), [])
+        self.assertEqual(self._ids("label == 'plum'"), [3])
+        execute_query({"type": "delete", "table": "eng_items"})
+        self.assertEqual(self._ids("label == 'plum'"), [])
+
+    def test_index_agrees_with_scan(self):
+        execute_query({"type": "insert", "into": "eng_items", "values": [5, "a.b", 1.5]})
+        execute_query({"type": "insert", "into": "eng_items", "values": [6, "a_b", 15]})
+        schema, rows = engine.fetch_table_rows("eng_items")
+        for where in ("qty == 1.5", "label == 'a.b'", "'a.b' == label"):
+            with self.subTest(where=where):
+                plan = engine.prepare_select({"from": "eng_items", "where": where, "columns": []})
+                self.assertIsNotNone(plan.lookup)
+                hits = engine.eval_rows(engine.compile_condition(where, schema), rows)
+                self.assertEqual(self._ids(where), [row[0] for row, hit in zip(rows, hits) if hit])
+
+
+class TestTableRegistry(EngineTestCase):
+    def test_show_and_views(self):
+        names = [row[0] for row in execute_query({"type": "show_table"})[1]]
+        self.assertIn("eng_items", names)
+        self.assertEqual(names, sorted(names))
+        self.assertIn("eng_items", tables.keys())
+        self.assertIn(("eng_items", tables["eng_items"]), tables.items())
+        self.assertEqual(len(tables.values()), len(names))
+
+
+class TestJoin(EngineTestCase):
+    def setUp(self):
+        super().setUp()
+        _create("eng_stock", ["item_id", "label", "shop"], [
+            (1, "apple", "north"), (2, "pear", "north"), (1, "apple", "south"), (9, "kiwi", "east")
+        ])
+
+    def _join(self, on, join_type="inner"):
+        return execute_query({
+            "type": "select",
+            "from": {"left": "eng_items", "right": "eng_stock", "on": on, "join_type": join_type},
+            "columns": [{"expr": "eng_items.id", "alias": "id"}, {"expr": "eng_stock.shop", "alias": "shop"}],
+            "where": None
+        })
+
+    def test_inner_and_left(self):
+        self.assertEqual(self._join([("id", "item_id")]), (
+            ["id", "shop"], [[1, "north"], [1, "south"], [2, "north"]]
+        ))
+        self.assertEqual(self._join([("id", "item_id")], "left")[1], [
+            [1, "north"], [1, "south"], [2, "north"], [3, None], [4, None]
+        ])
+
+    def test_composite_key(self):
+        execute_query({"type": "update", "table": "eng_stock", "set": {"label": "'apricot'"}, "where": "shop == 'south'"})
+        self.assertEqual(self._join([("id", "item_id"), ("label", "label")])[1], [[1, "north"], [2, "north"]])
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self._join([("id", "missing")])
+
+
+class TestGroupBy(EngineTestCase):
+    def test_aggregates(self):
+        ir = {
+            "type": "select", "from": "eng_items", "where": None, "group_by": ["label"],
+            "columns": [{"expr": "label"}] + [
+                {"agg": agg, "expr": "qty", "alias": agg.lower()} for agg in ("SUM", "COUNT", "AVG", "MIN", "MAX")
+            ]
+        }
+        self.assertEqual(execute_query(ir), (
+            ["label", "sum", "count", "avg", "min", "max"],
+            [["apple", 10, 1, 10.0, 10, 10], ["pear", 10, 2, 5.0, 3, 7], ["plum", 30, 1, 30.0, 30, 30]]
+        ))
+
+    def test_unsupported_aggregate(self):
+        ir = {"type": "select", "from": "eng_items", "where": None, "group_by": ["label"],
+              "columns": [{"agg": "MEDIAN", "expr": "qty", "alias": "m"}]}
+        with self.assertRaises(NotImplementedError):
+            execute_query(ir)
+
+
+class TestOrderLimit(EngineTestCase):
+    def _ordered(self, order_by, limit=None, offset=None):
+        # ORDER BY applies to the projected rows, so the sort columns are selected
+        rows = self._select(["id", "label", "qty"], order_by=order_by, limit=limit, offset=offset)[1]
+        return [row[:1] for row in rows]
+
+    def test_single_direction(self):
+        self.assertEqual(self._ordered([("qty", True)]), [[2], [4], [1], [3]])
+        self.assertEqual(self._ordered([("qty", False)]), [[3], [1], [4], [2]])
+        # With a LIMIT the first rows are picked from a heap
+        self.assertEqual(self._ordered([("qty", True)], limit=2), [[2], [4]])
+        self.assertEqual(self._ordered([("qty", False)], limit=2, offset=1), [[1], [4]])
+        self.assertEqual(self._ordered([("label", True), ("id", True)], limit=3), [[1], [2], [4]])
+
+    def test_mixed_directions(self):
+        self.assertEqual(self._ordered([("label", True), ("qty", False)]), [[1], [4], [2], [3]])
+        self.assertEqual(self._ordered([("label", False), ("id", False)], limit=3), [[3], [4], [2]])
+        self.assertEqual(self._ordered([("label", True), ("qty", False)], limit=2, offset=1), [[4], [2]])
+
+    def test_descending_wrapper(self):
+        values = [3, 1, 2, 1]
+        self.assertEqual(sorted(values, key=engine._Descending), [3, 2, 1, 1])
+        self.assertEqual(engine._Descending(1), engine._Descending(1))
+
+    def test_dict_rows(self):
+        rows = [{"a": 2, "b": "x"}, {"a": 1, "b": "y"}, {"a": 2, "b": "z"}]
+        self.assertEqual(engine.order_limit(list(rows), [("a", False), ("b", True)], limit=2), [rows[0], rows[2]])
+        self.assertEqual(engine.order_limit(list(rows), [("a", True), ("b", False)]), [rows[1], rows[2], rows[0]])
+
+
+class TestPreparedPlans(EngineTestCase):
+    IR = {"type": "select", "from": "eng_items", "where": "qty > 5", "columns": [{"expr": "id"}, {"expr": "qty"}]}
+
+    def test_plan_is_reused(self):
+        plan = engine.get_prepared_select(self.IR)
+        self.assertIs(engine.get_prepared_select(dict(self.IR)), plan)
+        execute_query({"type": "insert", "into": "eng_items", "values": [5, "fig", 8]})
+        self.assertIs(engine.get_prepared_select(self.IR), plan)
+        self.assertEqual(execute_query(self.IR)[1], [[1, 10], [3, 30], [4, 7], [5, 8]])
+
+    def test_recreated_table(self):
+        plan = engine.get_prepared_select(self.IR)
+        self.assertEqual(execute_query(self.IR)[1], [[1, 10], [3, 30], [4, 7]])
+        execute_query({"type": "drop_table", "name": "eng_items"})
+        _create("eng_items", ["qty", "id"], [(8, 1), (2, 20)])
+        self.assertIsNot(engine.get_prepared_select(self.IR), plan)
+        self.assertEqual(execute_query(self.IR), (["id", "qty"], [[1, 8]]))
+
+    def test_renamed_table(self):
+        plan = engine.get_prepared_select(self.IR)
+        execute_query({"type": "rename_table", "old_name": "eng_items", "new_name": "eng_old"})
+        with self.assertRaises(ValueError):
+            execute_query(self.IR)
+        _create("eng_items", ["id", "note", "qty"], [(7, "x", 70)])
+        self.assertIsNot(engine.get_prepared_select(self.IR), plan)
+        self.assertEqual(execute_query(self.IR)[1], [[7, 70]])
+
+
+if __name__ == "__main__":
+    unittest.main()
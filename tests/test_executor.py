@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core.json_table import JSONTable
+from planner.executor import Executor, _table_cache
+
+
+class TestExecutor(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.executor = Executor("people")
+        self.executor.create_table(["id", "name", "age"])
+
+    def tearDown(self):
+        _table_cache.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_inserts_are_written_through(self):
+        self.executor.insert([1, "Alice", 30])
+        self.assertEqual(JSONTable.load("people").rows, [[1, "Alice", 30]])
+        self.executor.insert([2, "Bob", 20])
+        self.assertEqual(JSONTable.load("people").rows, [[1, "Alice", 30], [2, "Bob", 20]])
+
+    def test_failed_write_is_not_shared(self):
+        self.executor.insert([1, "Alice", 30])
+        with mock.patch.object(JSONTable, "save", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.executor.insert([2, "Bob", 20])
+        self.assertEqual([row["id"] for row in Executor("people").select()], [1])
+
+    def test_executors_share_a_loaded_table(self):
+        self.executor.insert([1, "Alice", 30])
+        other = Executor("people")
+        self.assertEqual(other.select(), [{"id": 1, "name": "Alice", "age": 30}])
+
+    def test_select_with_criteria(self):
+        self.executor.insert([1, "Alice", 30])
+        self.executor.insert([2, "Bob", 20])
+        self.executor.insert([3, "Cara", 25])
+        criteria = [
+            {"column": "age", "operator": ">=", "value": 25},
+            {"column": "id", "operator": "not in", "value": [1]},
+            {"column": "missing", "operator": "=", "value": 0}
+        ]
+        self.assertEqual(self.executor.select(criteria, ["name"]), [{"name": "Cara"}])
+        self.assertIsNone(self.executor.select([{"column": "id", "operator": "=", "value": 9}]))
+
+    def test_reload_after_file_changes(self):
+        self.executor.insert([1, "Alice", 30])
+        table = JSONTable.load("people")
+        table.insert([2, "Bob", 20])
+        table.save()
+        self.assertEqual([row["id"] for row in self.executor.select()], [1, 2])
+
+    def test_existing_table_is_not_replaced(self):
+        self.executor.insert([1, "Alice", 30])
+        del self.executor
+
+        executor = Executor("people")
+        executor.create_table(["id", "name", "age"])
+        executor.insert([2, "Bob", 20])
+        self.assertEqual(JSONTable.load("people").rows, [[1, "Alice", 30], [2, "Bob", 20]])
+
+
+if __name__ == "__main__":
+    unittest.main()
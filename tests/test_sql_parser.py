@@ -0,0 +1,48 @@
+import unittest
+
+from lark.exceptions import UnexpectedInput
+
+from parser.lark_parser import parser as lark_parser
+from parser.sql_parser import SQLParser
+
+
+class TestSQLParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = SQLParser()
+
+    def test_matches_lark_output(self):
+        statements = [
+            "SELECT name, age FROM users WHERE age >= 25;",
+            "SELECT name, price_div_two(price) FROM users WHERE is_expensive(price)",
+            "SELECT a FROM t WHERE f(a) + 1 != 'x'; SELECT b FROM t WHERE b < -2.5;",
+            "SELECT a FROM t WHERE flag = TRUE AND",
+            "SELECT DISTINCT name, f(age) FROM users WHERE age > 1; SELECT DISTINCTx FROM t",
+            "SELECT DISTINCT FROM t",
+            "INSERT INTO users (id, name, score) VALUES (1, 'Alice', 9.5);",
+            "CREATE TABLE users (id INT, name TEXT, score FLOAT, active BOOL);",
+            "CREATE FUNCTION f(x INT) RETURNS INT BEGIN "
+            "IF x > 10 THEN RETURN x * 2; ELSE RETURN x; END IF; END;",
+        ]
+        for sql in statements:
+            with self.subTest(sql=sql):
+                try:
+                    expected = repr(lark_parser.parse(sql))
+                except UnexpectedInput:
+                    with self.assertRaises(UnexpectedInput):
+                        self.parser.parse(sql)
+                    continue
+                self.assertEqual(repr(self.parser.parse(sql)), expected)
+
+    def test_names_are_lark_tokens(self):
+        select = self.parser.parse("SELECT name FROM users WHERE age > 1")[0]
+        self.assertEqual(select["columns"][0].type, "NAME")
+        self.assertEqual(select["where"]["left"].type, "NAME")
+        self.assertEqual(select["where"]["right"], 1)
+
+    def test_legacy_uses_lark(self):
+        sql = "SELECT name FROM users;"
+        self.assertEqual(SQLParser(legacy=True).parse(sql), lark_parser.parse(sql))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 # tests/test_sqlite_table.py
 import sqlite3
+import threading
 from core.sqlite_table import SQLiteTable
 
 
@@ -70,5 +71,41 @@ def test_sqlite_table():
     print("\nAll SQLite table operations tested successfully.")
 
 
+
+def test_sqlite_table_concurrent_reads():
+    """
+    Verify that several threads can read the same SQLiteTable at once,
+    each through its own connection.
+    """
+    table_name = "students_sqlite_threads"
+    with sqlite3.connect("db.sqlite") as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+
+    table = SQLiteTable(table_name, ["id", "name"], {"id": "INTEGER", "name": "TEXT"})
+    for i in range(20):
+        table.insert([i, f"student_{i}"])
+    expected = table.select_all()
+
+    results = []
+    errors = []
+
+    def reader():
+        try:
+            results.append(SQLiteTable.load(table_name).select_all())
+        except Exception as e:  # surfaced through the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, errors
+    assert len(results) == 8
+    assert all(rows == expected for rows in results)
+
+
 if __name__ == "__main__":
-    test_sqlite_table()
\ No newline at end of file
+    test_sqlite_table()
+    test_sqlite_table_concurrent_reads()
\ No newline at end of file
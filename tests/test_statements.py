@@ -0,0 +1,133 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import unittest
+
+from core.table_manager import TableManager
+from common.statements import compile_statement, execute_statement, split_statements
+from IR.intermediateRepresentation import inline_udf_in_ir
+from IR.udf.manager import UDFManager
+
+
+class TestSplitStatements(unittest.TestCase):
+    def test_comments_and_line_breaks(self):
+        text = "-- header\nSELECT a\n  FROM t; -- trailing\nSELECT b FROM t WHERE b = 'x;y';\nSELECT c"
+        self.assertEqual(split_statements(text), [
+            "SELECT a FROM t;",
+            "SELECT b FROM t WHERE b = 'x;y';"
+        ])
+
+    def test_function_body_is_one_statement(self):
+        text = ("CREATE FUNCTION f(x INT) RETURNS INT\nBEGIN\n"
+                "    IF x > 1 THEN RETURN x; ELSE RETURN 0; END IF;\nEND;\nSELECT a FROM t;")
+        self.assertEqual(split_statements(text), [
+            "CREATE FUNCTION f(x INT) RETURNS INT BEGIN "
+            "IF x > 1 THEN RETURN x; ELSE RETURN 0; END IF; END;",
+            "SELECT a FROM t;"
+        ])
+
+
+class TestExecuteStatement(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.manager = TableManager(data_dir=self.data_dir)
+        self.manager.create_table("items", [
+            {"name": "id", "datatype": "INT"},
+            {"name": "label", "datatype": "TEXT"},
+            {"name": "qty", "datatype": "INT"}
+        ])
+        for row in ([1, "apple", 10], [2, "pear", 3], [3, "plum", 30], [4, "pear", 3]):
+            self.manager.insert_into("items", ["id", "label", "qty"], row)
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.data_dir)
+
+    def _select(self, sql):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for ir in compile_statement(sql)[1]:
+                self.assertTrue(execute_statement(ir, self.manager, None))
+        lines = out.getvalue().splitlines()
+        return lines[lines.index(next(l for l in lines if l.startswith("---"))):]
+
+    def test_select_filters(self):
+        self.assertEqual(self._select("SELECT label, qty FROM items WHERE qty < 20"), [
+            "-----------",
+            "label | qty",
+            "-----------",
+            "apple | 10",
+            "pear | 3",
+            "pear | 3",
+            "-----------"
+        ])
+
+    def test_select_distinct(self):
+        self.assertEqual(self._select("SELECT DISTINCT label, qty FROM items WHERE qty < 20"), [
+            "-----------",
+            "label | qty",
+            "-----------",
+            "apple | 10",
+            "pear | 3",
+            "-----------"
+        ])
+        self.assertEqual(self._select("SELECT DISTINCT label FROM items")[3:-1], ["apple", "pear", "plum"])
+
+    def test_inlined_expression(self):
+        ir = {
+            "type": "select",
+            "table": "items",
+            "columns": ["label", "qty", {
+                "type": "inlined_expression",
+                "original_function_call": {"function_name": "half", "arguments": ["qty"]},
+                "expression": {"type": "arithmetic", "left": "qty", "op": "/", "right": 2}
+            }],
+            "where": {"type": "comparison", "left": "qty", "op": ">", "right": 5}
+        }
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertTrue(execute_statement(ir, self.manager, None))
+        self.assertIn("label | qty | half('qty')", out.getvalue())
+        self.assertIn("apple | 10 | 5.0", out.getvalue())
+        self.assertIn("plum | 30 | 15.0", out.getvalue())
+        self.assertNotIn("pear", out.getvalue())
+
+
+class TestInlining(unittest.TestCase):
+    def setUp(self):
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        self.udf_manager = UDFManager(data_dir=data_dir)
+        self.udf_manager.register_function({
+            "name": "half",
+            "params": [{"name": "x", "type": "INT"}],
+            "return_type": "FLOAT",
+            "body": {"type": "arithmetic", "left": "x", "op": "/", "right": 2}
+        }, persist=False)
+
+    def test_only_paths_to_calls_are_copied(self):
+        insert = compile_statement("INSERT INTO items (id, label) VALUES (1, 'a');")[1][0]
+        self.assertIs(inline_udf_in_ir(insert, self.udf_manager), insert)
+
+        select = compile_statement("SELECT label, half(qty) FROM items WHERE qty > 2;")[1][0]
+        inlined = inline_udf_in_ir(select, self.udf_manager)
+        self.assertEqual(select["columns"][1]["type"], "function_call")
+        self.assertEqual(inlined["columns"][1]["type"], "inlined_expression")
+        self.assertIs(inlined["where"], select["where"])
+
+    def test_literal_arguments_are_folded(self):
+        select = compile_statement("SELECT half(9), half(qty), half(0) FROM items;")[1][0]
+        columns = inline_udf_in_ir(select, self.udf_manager)["columns"]
+        self.assertEqual(columns[0]["expression"], 4.5)
+        self.assertEqual(columns[1]["expression"]["type"], "arithmetic")
+        self.assertEqual(columns[2]["expression"], 0.0)
+
+    def test_argument_count_is_checked(self):
+        for sql in ("SELECT half() FROM items;", "SELECT half(qty, 2) FROM items;"):
+            with self.subTest(sql=sql), self.assertRaises(ValueError):
+                inline_udf_in_ir(compile_statement(sql)[1][0], self.udf_manager)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.table_manager import TableManager
+
+
+class TestTableManager(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.manager = TableManager(data_dir=self.data_dir)
+        self.manager.create_table("items", [
+            {"name": "id", "datatype": "INT"},
+            {"name": "label", "datatype": "TEXT"},
+            {"name": "cost", "datatype": "FLOAT"}
+        ])
+        self.manager.insert_into("items", ["id", "label", "cost"], [1, "apple", 1.5])
+        self.manager.insert_into("items", ["id", "label", "cost"], [2, "pear", 2.25])
+        self.manager.insert_into("items", ["id", "label"], [3, "fig"])
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.data_dir)
+
+    def test_select_all(self):
+        self.assertEqual(self.manager.select_from("items"), [
+            {"id": 1, "label": "apple", "cost": 1.5},
+            {"id": 2, "label": "pear", "cost": 2.25},
+            {"id": 3, "label": "fig", "cost": None}
+        ])
+
+    def test_insert_casts_to_column_type(self):
+        self.manager.insert_into("items", ["id", "label", "cost"], [4, "plum", 10])
+        where = {"type": "comparison", "left": "id", "op": "=", "right": 4}
+        cost = self.manager.select_from("items", ["cost"], where)[0]["cost"]
+        self.assertIs(type(cost), float)
+        self.assertEqual(cost, 10.0)
+
+        self.manager.close()
+        reloaded = TableManager(data_dir=self.data_dir)
+        self.assertEqual(reloaded.select_from("items", ["cost"], where), [{"cost": 10.0}])
+        self.assertIs(type(reloaded.select_from("items", ["cost"], where)[0]["cost"]), float)
+
+    def test_select_columns_with_where(self):
+        where = {"type": "comparison", "left": "id", "op": ">=", "right": 2}
+        self.assertEqual(
+            self.manager.select_from("items", ["label"], where),
+            [{"label": "pear"}, {"label": "fig"}]
+        )
+
+    def test_conjunctive_where(self):
+        where = [
+            {"type": "comparison", "left": "label", "op": "!=", "right": "fig"},
+            {"type": "comparison", "left": "id", "op": ">", "right": 1}
+        ]
+        self.assertEqual(self.manager.select_from("items", ["id"], where), [{"id": 2}])
+        # id = 2 is evaluated first, so the NULL cost of "fig" is never compared
+        where = [
+            {"type": "comparison", "left": "cost", "op": ">", "right": 2.0},
+            {"type": "comparison", "left": "id", "op": "=", "right": 2}
+        ]
+        self.assertEqual(self.manager.count_from("items", where), 1)
+
+    def test_index_lookup(self):
+        self.manager.create_index("items", "label")
+        self.manager.insert_into("items", ["id", "label"], [4, "pear"])
+        where = {"type": "comparison", "left": "label", "op": "=", "right": "pear"}
+        self.assertEqual(self.manager.select_from("items", ["id"], where), [{"id": 2}, {"id": 4}])
+        self.assertEqual(self.manager.count_from("items", where), 2)
+        where["right"] = "kiwi"
+        self.assertEqual(self.manager.select_from("items", ["id"], where), [])
+
+    def test_select_as_tuples(self):
+        self.assertEqual(
+            self.manager.select_from("items", ["label", "id"], as_tuples=True),
+            [("apple", 1), ("pear", 2), ("fig", 3)]
+        )
+        where = {"type": "comparison", "left": "id", "op": ">=", "right": 2}
+        self.assertEqual(self.manager.select_from("items", ["cost"], where, as_tuples=True),
+                         [(2.25,), (None,)])
+        self.manager.create_index("items", "label")
+        where = {"type": "comparison", "left": "label", "op": "=", "right": "pear"}
+        self.assertEqual(self.manager.select_from("items", ["id", "cost"], where, as_tuples=True),
+                         [(2, 2.25)])
+
+    def test_count_from(self):
+        self.assertEqual(self.manager.count_from("items"), 3)
+        where = {"type": "comparison", "left": "label", "op": "!=", "right": "pear"}
+        self.assertEqual(self.manager.count_from("items", where), 2)
+
+    def test_disk_layout_and_reload(self):
+        self.manager.flush()
+        self.assertFalse(os.path.exists(os.path.join(self.data_dir, "items.log.jsonl")))
+        with open(os.path.join(self.data_dir, "items.json")) as f:
+            stored = json.load(f)
+        self.assertEqual(stored["rows"], [[1, "apple", 1.5], [2, "pear", 2.25], [3, "fig", None]])
+
+        reloaded = TableManager(data_dir=self.data_dir)
+        self.assertEqual(reloaded.select_from("items"), self.manager.select_from("items"))
+
+    def test_unflushed_inserts_are_replayed(self):
+        log_path = os.path.join(self.data_dir, "items.log.jsonl")
+        self.assertTrue(os.path.exists(log_path))
+
+        reloaded = TableManager(data_dir=self.data_dir)
+        self.assertEqual(reloaded.select_from("items"), self.manager.select_from("items"))
+
+    def test_insert_batch_is_atomic(self):
+        with self.assertRaises(ValueError):
+            self.manager.insert_batch("items", ["id", "label"], [[4, "kiwi"], ["bad", "plum"]])
+        self.assertEqual(len(self.manager.select_from("items")), 3)
+
+        self.manager.insert_batch("items", ["id", "label"], [[4, "kiwi"], [5, "plum"]])
+        self.assertEqual(len(self.manager.select_from("items")), 5)
+
+    def test_compaction(self):
+        self.manager.flush()
+        manager = TableManager(data_dir=self.data_dir, compact_every=2)
+        manager.insert_into("items", ["id"], [4])
+        manager.insert_into("items", ["id"], [5])
+        self.assertFalse(os.path.exists(os.path.join(self.data_dir, "items.log.jsonl")))
+        with open(os.path.join(self.data_dir, "items.json")) as f:
+            self.assertEqual(len(json.load(f)["rows"]), 5)
+
+    def test_invalid_column(self):
+        with self.assertRaises(ValueError):
+            self.manager.select_from("items", ["missing"])
+        with self.assertRaises(ValueError):
+            self.manager.insert_into("items", ["missing"], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
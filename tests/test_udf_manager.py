@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+import unittest
+
+from IR.udf.manager import UDFManager
+
+
+class TestUDFManagerBatch(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.manager = UDFManager(data_dir=self.data_dir)
+        self.manager.register_function({
+            "name": "is_adult",
+            "params": [{"name": "age", "type": "INT"}],
+            "return_type": "TEXT",
+            "body": {
+                "type": "if_stmt",
+                "condition": {"type": "comparison", "left": "age", "op": ">=", "right": 18},
+                "then": {"type": "return_stmt", "value": "adult"},
+                "else": {"type": "return_stmt", "value": "child"}
+            }
+        }, persist=False)
+        self.manager.register_function({
+            "name": "weighted",
+            "params": [{"name": "grade", "type": "FLOAT"}, {"name": "weight", "type": "FLOAT"}],
+            "return_type": "FLOAT",
+            "body": {"type": "arithmetic", "left": "grade", "op": "*", "right": "weight"}
+        }, persist=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_batch_matches_single_calls(self):
+        ages = [25, 16, "30", 18.0]
+        self.assertEqual(
+            self.manager.execute_batch("is_adult", zip(ages)),
+            [self.manager.execute_function("is_adult", [age]) for age in ages]
+        )
+        self.assertEqual(
+            self.manager.execute_batch("weighted", zip([3.0, 4], [0.5, 2])),
+            [1.5, 8.0]
+        )
+
+    def test_batch_errors(self):
+        with self.assertRaises(ValueError):
+            self.manager.execute_batch("missing", [])
+        with self.assertRaises(ValueError):
+            self.manager.execute_batch("weighted", [(1.0,)])
+        with self.assertRaises(ValueError):
+            self.manager.execute_batch("is_adult", [(None,)])
+
+    def test_redefinition_and_lazy_errors(self):
+        self.assertEqual(self.manager.execute_function("weighted", [2, 3]), 6.0)
+        self.manager.register_function({
+            "name": "weighted",
+            "params": [{"name": "grade", "type": "FLOAT"}, {"name": "weight", "type": "FLOAT"}],
+            "return_type": "FLOAT",
+            "body": {
+                "type": "if_stmt",
+                "condition": {"type": "comparison", "left": "weight", "op": ">", "right": 0},
+                "then": {"type": "arithmetic", "left": "grade", "op": "+", "right": "1.5"},
+                "else": {"type": "arithmetic", "left": "grade", "op": "%", "right": "weight"}
+            }
+        }, persist=False)
+        self.assertEqual(self.manager.execute_function("weighted", [2, 3]), 3.5)
+        with self.assertRaises(ValueError):
+            self.manager.execute_function("weighted", [2, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()